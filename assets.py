@@ -0,0 +1,176 @@
+"""
+Tahap aset tambahan: subtitle, chapters, dan deskripsi.
+
+Sumbernya adalah file `.info.json` yang sudah ditulis yt-dlp saat download
+(info dict ter-cache di disk), jadi tidak ada ekstraksi ulang. Semua URL
+subtitle dari seluruh playlist dikumpulkan dulu, lalu di-fetch paralel
+lewat satu pool koneksi. Aset yang sudah ada di disk dilewati.
+"""
+
+import os
+import json
+import time
+import tempfile
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import transport
+
+INFO_SUFFIX = '.info.json'
+DEFAULT_SUB_FORMATS = ('vtt', 'srt', 'ttml', 'json3')
+DEFAULT_WORKERS = 8
+TIMEOUT = 30
+
+
+class Asset:
+    """Satu file sidecar yang akan ditulis (dari URL atau konten lokal)."""
+    __slots__ = ('kind', 'path', 'url', 'content')
+
+    def __init__(self, kind, path, url=None, content=None):
+        self.kind = kind
+        self.path = path
+        self.url = url
+        self.content = content
+
+
+def info_path_for(media_path):
+    """Path `.info.json` yang ditulis yt-dlp di samping file media `media_path`."""
+    return os.path.splitext(media_path)[0] + INFO_SUFFIX
+
+
+def _match_languages(available, languages):
+    if 'all' in languages:
+        return sorted(available)
+    matched = []
+    for lang in languages:
+        # 'en' juga cocok dengan 'en-US', 'en-GB', ...
+        for code in sorted(available):
+            if (code == lang or code.startswith(lang + '-')) and code not in matched:
+                matched.append(code)
+    return matched
+
+
+def _pick_track(tracks, sub_formats):
+    for ext in sub_formats:
+        for track in tracks:
+            if track.get('ext') == ext and track.get('url'):
+                return track
+    return None
+
+
+def collect_assets(info_path, languages=(), include_auto=False, chapters=False,
+                   description=False, sub_formats=DEFAULT_SUB_FORMATS):
+    """Kumpulkan aset yang belum ada di disk untuk satu video."""
+    with open(info_path, 'r', encoding='utf-8') as f:
+        info = json.load(f)
+    base = info_path[:-len(INFO_SUFFIX)]
+    assets = []
+
+    if languages:
+        subtitles = dict(info.get('automatic_captions') or {}) if include_auto else {}
+        # Subtitle manual lebih diutamakan daripada auto-generated
+        subtitles.update(info.get('subtitles') or {})
+        for lang in _match_languages(subtitles, languages):
+            track = _pick_track(subtitles[lang], sub_formats)
+            if track:
+                assets.append(Asset('subtitle', f"{base}.{lang}.{track['ext']}", url=track['url']))
+
+    if chapters and info.get('chapters'):
+        content = json.dumps(info['chapters'], ensure_ascii=False, indent=2)
+        assets.append(Asset('chapters', f"{base}.chapters.json", content=content))
+
+    if description and info.get('description'):
+        assets.append(Asset('description', f"{base}.description", content=info['description']))
+
+    return [asset for asset in assets if not _exists(asset.path)]
+
+
+def _exists(path):
+    return os.path.exists(path) and os.path.getsize(path) > 0
+
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix='.asset.', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class _Fetcher:
+    """GET via pool koneksi bersama (transport.py), fallback ke urllib."""
+
+    def __init__(self):
+        # Pool yang sama dengan yt-dlp: koneksi ke host subtitle sering sudah hangat
+        self.pool = transport.pool_manager()
+
+    def get(self, url):
+        if self.pool is not None:
+            response = self.pool.request('GET', url, timeout=TIMEOUT, retries=2)
+            if response.status >= 400:
+                raise OSError(f"HTTP {response.status}")
+            return response.data
+        with urllib.request.urlopen(url, timeout=TIMEOUT) as response:
+            return response.read()
+
+    def close(self):
+        # Pool bersama tetap hidup untuk request berikutnya
+        pass
+
+
+def fetch_assets(assets, max_workers=DEFAULT_WORKERS, fetcher=None):
+    """Tulis semua aset secara paralel. Return (jumlah_ditulis, list_gagal)."""
+    own_fetcher = fetcher is None
+    fetcher = fetcher or _Fetcher()
+
+    def write(asset):
+        data = fetcher.get(asset.url) if asset.url else asset.content.encode('utf-8')
+        _write_atomic(asset.path, data)
+
+    written = 0
+    failed = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(write, asset): asset for asset in assets}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    written += 1
+                except Exception as e:
+                    failed.append((futures[future].path, str(e)))
+    finally:
+        if own_fetcher:
+            fetcher.close()
+    return written, failed
+
+
+def download_assets(media_paths, languages=(), include_auto=False, chapters=False,
+                    description=False, max_workers=DEFAULT_WORKERS):
+    """Tahap aset untuk video yang baru didownload: kumpulkan lalu fetch paralel.
+
+    `media_paths` adalah path final setiap item (event `item_finished`);
+    metadata dibaca dari `.info.json` di sampingnya, jadi file lain di folder
+    output tidak pernah disentuh. Return dict ringkasan: jumlah video, aset
+    ditulis, aset gagal, waktu.
+    """
+    start = time.perf_counter()
+    info_files = [path for path in dict.fromkeys(info_path_for(p) for p in media_paths if p)
+                  if os.path.exists(path)]
+    assets = []
+    for info_path in info_files:
+        try:
+            assets.extend(collect_assets(info_path, languages, include_auto, chapters, description))
+        except (OSError, ValueError):
+            continue
+    written, failed = fetch_assets(assets, max_workers) if assets else (0, [])
+    return {
+        'videos': len(info_files),
+        'written': written,
+        'failed': failed,
+        'elapsed': time.perf_counter() - start,
+    }
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Simulasi policy scheduler pada campuran job sintetis.
+
+Setiap job adalah thread yang datang bertahap, meminta slot lewat
+`JobScheduler.acquire`, lalu mensimulasikan download (sleep sesuai ukuran
+dan bandwidth worker) sebelum `release`, persis seperti
+`DownloadSupervisor.download`. Waktu dipercepat `--speedup` kali agar satu
+run selesai dalam hitungan detik. Untuk setiap policy dilaporkan rata-rata
+dan p95 waktu selesai job (sejak kedatangan, dalam menit simulasi).
+
+    python benchmarks/bench_scheduler.py [--jobs 200] [--workers 4] [--speedup 5000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import JobScheduler, POLICIES
+
+BANDWIDTH = 5_000_000  # byte/detik per worker
+BYTES_PER_SECOND = 250_000  # ukuran media per detik durasi
+
+
+MIXES = {
+    # nama: list (bobot, durasi_min_detik, durasi_max_detik)
+    'clips+streams': [(0.85, 60, 300), (0.15, 2 * 3600, 4 * 3600)],
+    'uniform': [(1.0, 60, 3600)],
+    'mostly-long': [(0.3, 60, 300), (0.7, 3600, 3 * 3600)],
+}
+
+
+def make_jobs(mix, count, uploaders, rng):
+    """List info job (format job_info supervisor) plus waktu kedatangan."""
+    jobs = []
+    for _ in range(count):
+        roll = rng.random()
+        for weight, low, high in mix:
+            if roll < weight:
+                break
+            roll -= weight
+        duration = rng.uniform(low, high)
+        jobs.append({
+            'duration': duration,
+            'filesize': int(duration * BYTES_PER_SECOND * rng.uniform(0.8, 1.2)),
+            'uploader': f"channel-{rng.randrange(uploaders)}",
+            'priority': 1 if rng.random() < 0.1 else 0,
+            # Kedatangan bertahap dalam 10 menit pertama
+            'arrival': rng.uniform(0, 600),
+        })
+    return jobs
+
+
+def simulate(jobs, workers, policy, speedup):
+    """Return list waktu selesai (detik simulasi, sejak kedatangan) setiap job."""
+    scheduler = JobScheduler(workers, policy)
+    turnaround = []
+    lock = threading.Lock()
+    start = time.perf_counter()
+
+    def now():
+        return (time.perf_counter() - start) * speedup
+
+    def run(info):
+        delay = (info['arrival'] - now()) / speedup
+        if delay > 0:
+            time.sleep(delay)
+        arrived = now()
+        job = scheduler.acquire(info)
+        try:
+            # "Download" di worker
+            time.sleep(info['filesize'] / BANDWIDTH / speedup)
+        finally:
+            scheduler.release(job)
+        with lock:
+            turnaround.append(now() - arrived)
+
+    threads = [threading.Thread(target=run, args=(info,), daemon=True) for info in jobs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return turnaround
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--uploaders', type=int, default=20)
+    parser.add_argument('--speedup', type=float, default=5000,
+                        help='Percepatan waktu simulasi (default: 5000)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for mix_name, mix in MIXES.items():
+        jobs = make_jobs(mix, args.jobs, args.uploaders, random.Random(args.seed))
+        print(f"\nMix: {mix_name} ({args.jobs} job, {args.workers} worker)")
+        print(f"{'policy':<10}{'mean (menit)':>14}{'p95 (menit)':>14}{'wall (s)':>10}")
+        for name in POLICIES:
+            started = time.perf_counter()
+            turnaround = simulate(jobs, args.workers, name, args.speedup)
+            wall = time.perf_counter() - started
+            mean = sum(turnaround) / len(turnaround)
+            print(f"{name:<10}{mean / 60:>14.1f}{percentile(turnaround, 95) / 60:>14.1f}{wall:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
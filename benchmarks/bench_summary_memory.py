@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark memori: dict info playlist penuh vs InfoSummary.
+
+Membuat playlist sintetis 50k entries (bentuk mirip hasil flat extract
+yt-dlp) lalu membandingkan memori yang tertahan setelah fetch.
+
+    python benchmarks/bench_summary_memory.py [--entries 50000]
+"""
+
+import os
+import sys
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from summary import InfoSummary
+
+
+def make_entry(i):
+    video_id = f"vid{i:08d}"
+    return {
+        '_type': 'url',
+        'ie_key': 'Youtube',
+        'id': video_id,
+        'url': f"https://www.youtube.com/watch?v={video_id}",
+        'title': f"Synthetic video number {i} with a reasonably long title",
+        'description': None,
+        'duration': 60 + i % 3600,
+        'channel_id': 'UCsynthetic',
+        'channel': 'Synthetic Channel',
+        'channel_url': 'https://www.youtube.com/channel/UCsynthetic',
+        'uploader': 'Synthetic Channel',
+        'view_count': i * 17,
+        'thumbnails': [
+            {'url': f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg?sqp={size}", 'height': size, 'width': size * 16 // 9}
+            for size in (94, 110, 138, 188)
+        ],
+        'live_status': None,
+    }
+
+
+def make_info(count, lazy):
+    entries = (make_entry(i) for i in range(count))
+    return {
+        '_type': 'playlist',
+        'id': 'PLsynthetic',
+        'title': 'Synthetic Playlist',
+        'uploader': 'Synthetic Channel',
+        'entries': entries if lazy else list(entries),
+    }
+
+
+def measure(label, build):
+    tracemalloc.start()
+    obj = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} retained {current / 1024 / 1024:8.1f} MB   peak {peak / 1024 / 1024:8.1f} MB")
+    return obj
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"Playlist sintetis: {args.entries:,} entries\n")
+
+    full = measure("dict info penuh", lambda: make_info(args.entries, lazy=False))
+    print(f"{'':<28} count = {len(full['entries']):,}")
+    del full
+
+    def build_summary():
+        summary = InfoSummary(make_info(args.entries, lazy=True))
+        summary.resolve_count()
+        return summary
+
+    summary = measure("InfoSummary (count resolved)", build_summary)
+    print(f"{'':<28} count = {summary.count:,}")
+
+    def build_known_count():
+        info = make_info(args.entries, lazy=True)
+        info['playlist_count'] = args.entries
+        summary = InfoSummary(info)
+        summary.entries_page(0)
+        return summary
+
+    measure("InfoSummary (halaman 1)", build_known_count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark transport bersama (transport.py) terhadap server TLS lokal.
+
+Server HTTPS lokal (HTTP/1.1 keep-alive, sertifikat self-signed dari
+`openssl`) menghitung koneksi, handshake, dan session TLS yang di-resume
+dari sisi server. Simulasi run playlist: setiap item membuat YoutubeDL
+baru (seperti YouTubeHandler) dan mengirim beberapa request, dengan
+beberapa item berjalan paralel. Dijalankan dua kali: transport default
+yt-dlp, lalu transport bersama.
+
+`--connect-delay` menambah jeda per koneksi baru di server untuk meniru
+RTT jaringan sungguhan (TCP + handshake). `--max-per-conn` membuat server
+menutup koneksi keep-alive setelah N request (seperti CDN), sehingga
+koneksi baru ke host yang sama memakai resumption TLS.
+
+    python benchmarks/bench_transport.py [--items 40] [--requests 5] [--workers 4]
+"""
+
+import os
+import ssl
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yt_dlp
+import transport
+
+BODY = b'x' * 64 * 1024
+
+
+def make_certificate(directory):
+    cert = os.path.join(directory, 'cert.pem')
+    key = os.path.join(directory, 'key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+         '-subj', '/CN=localhost', '-keyout', key, '-out', cert],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+class Counters:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.connections = 0
+            self.resumed = 0
+            self.requests = 0
+
+
+class TLSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, context, connect_delay, max_per_conn):
+        self.context = context
+        self.connect_delay = connect_delay
+        self.max_per_conn = max_per_conn
+        self.counters = Counters()
+        super().__init__(address, Handler)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        server = self.server
+        if server.connect_delay:
+            time.sleep(server.connect_delay)
+        self.request = server.context.wrap_socket(self.request, server_side=True)
+        with server.counters.lock:
+            server.counters.connections += 1
+            server.counters.resumed += self.request.session_reused
+        self.served = 0
+        super().setup()
+
+    def do_GET(self):
+        with self.server.counters.lock:
+            self.server.counters.requests += 1
+        self.served += 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(len(BODY)))
+        if self.server.max_per_conn and self.served >= self.server.max_per_conn:
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_playlist(url, items, requests_per_item, workers):
+    opts = {
+        'quiet': True,
+        'no_warnings': True,
+        'nocheckcertificate': True,  # sertifikat self-signed
+        'proxy': '',
+    }
+
+    def item(index):
+        # YoutubeDL baru per item, sama seperti YouTubeHandler.download
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            for _ in range(requests_per_item):
+                with ydl.urlopen(f"{url}/media/{index}") as response:
+                    response.read()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(item, range(items)))
+    return time.perf_counter() - start
+
+
+def report(name, elapsed, counters):
+    reuse = 1 - counters.connections / counters.requests if counters.requests else 0.0
+    print(f"{name:<10}{elapsed:>10.2f}{counters.requests:>10}{counters.connections:>10}"
+          f"{counters.resumed:>10}{reuse * 100:>9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=40)
+    parser.add_argument('--requests', type=int, default=5, help='request per item')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--connect-delay', type=float, default=20, metavar='MS',
+                        help='jeda per koneksi baru di server (default: 20 ms)')
+    parser.add_argument('--max-per-conn', type=int, default=20, metavar='N',
+                        help='server menutup koneksi setelah N request (0: tanpa batas)')
+    parser.add_argument('--tls12', action='store_true', help='batasi server ke TLS 1.2')
+    args = parser.parse_args()
+
+    if shutil.which('openssl') is None:
+        sys.exit("openssl tidak ditemukan; dibutuhkan untuk membuat sertifikat uji.")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = make_certificate(directory)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        if args.tls12:
+            context.maximum_version = ssl.TLSVersion.TLSv1_2
+
+        server = TLSServer(('localhost', 0), context, args.connect_delay / 1000, args.max_per_conn)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"https://localhost:{server.server_address[1]}"
+
+        print(f"{args.items} item x {args.requests} request, {args.workers} worker, "
+              f"jeda koneksi {args.connect_delay:.0f} ms")
+        print(f"{'transport':<10}{'waktu (s)':>10}{'request':>10}{'koneksi':>10}{'resumed':>10}{'reuse':>10}")
+
+        transport.uninstall()
+        elapsed = run_playlist(url, args.items, args.requests, args.workers)
+        report('default', elapsed, server.counters)
+
+        server.counters.reset()
+        transport.STATS.reset()
+        transport.install()
+        elapsed = run_playlist(url, args.items, args.requests, args.workers)
+        report('bersama', elapsed, server.counters)
+
+        print("\nStatistik sisi klien (transport.stats):")
+        print(transport.format_stats())
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
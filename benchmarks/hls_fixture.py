@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Fixture live HLS lokal untuk menguji mode capture (capture.py).
+
+Server HTTP lokal mensimulasikan live stream: media playlist dengan
+sliding window, media sequence yang terus naik sesuai jam, dan segmen
+MPEG-TS palsu (paket 188 byte, sync byte 0x47) yang membawa nomor
+sequence-nya sendiri. Opsional: master playlist, EXT-X-ENDLIST setelah N
+segmen, dan error HTTP 500 acak untuk playlist/segmen.
+
+Setiap skenario menjalankan LiveCapture terhadap fixture lalu memeriksa:
+tidak ada file `.part` tersisa, index ffconcat sama dengan file di disk,
+retention dipatuhi, isi segmen berurutan tanpa duplikat (gap hanya sebanyak
+yang dilaporkan), dan progress berbasis durasi selalu naik.
+
+    python benchmarks/hls_fixture.py [--segment-duration 1.0] [--error-rate 0.1]
+    python benchmarks/hls_fixture.py --serve     # hanya jalankan server
+"""
+
+import os
+import sys
+import time
+import random
+import struct
+import argparse
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from capture import LiveCapture, INDEX_FILENAME
+
+PACKET_SIZE = 188
+PACKETS_PER_SEGMENT = 64
+
+
+def make_segment(sequence):
+    """Segmen TS palsu: setiap paket = sync byte + nomor sequence + padding."""
+    packet = b'\x47' + struct.pack('>I', sequence)
+    packet += b'\xff' * (PACKET_SIZE - len(packet))
+    return packet * PACKETS_PER_SEGMENT
+
+
+def segment_sequences(path):
+    """Nomor sequence berurutan yang ada di satu file segmen."""
+    sequences = []
+    with open(path, 'rb') as f:
+        data = f.read()
+    for offset in range(0, len(data), PACKET_SIZE * PACKETS_PER_SEGMENT):
+        packet = data[offset:offset + PACKET_SIZE]
+        assert packet[:1] == b'\x47', f"paket rusak di {path}@{offset}"
+        sequences.append(struct.unpack('>I', packet[1:5])[0])
+    return sequences
+
+
+class LiveServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, segment_duration=1.0, window=6, end_after=None, error_rate=0.0, seed=0):
+        self.segment_duration = segment_duration
+        self.window = window
+        self.end_after = end_after
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.errors = 0
+        super().__init__(('127.0.0.1', 0), Handler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def restart(self):
+        with self.lock:
+            self.started = time.monotonic()
+            self.errors = 0
+
+    def available(self):
+        """Jumlah segmen yang sudah 'tersiar' sejak server mulai."""
+        count = int((time.monotonic() - self.started) / self.segment_duration) + self.window
+        if self.end_after is not None:
+            count = min(count, self.end_after)
+        return count
+
+    def should_fail(self):
+        with self.lock:
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.errors += 1
+                return True
+        return False
+
+    def media_playlist(self):
+        count = self.available()
+        first = max(0, count - self.window)
+        lines = [
+            '#EXTM3U',
+            '#EXT-X-VERSION:3',
+            f'#EXT-X-TARGETDURATION:{max(1, round(self.segment_duration))}',
+            f'#EXT-X-MEDIA-SEQUENCE:{first}',
+        ]
+        for sequence in range(first, count):
+            lines.append(f'#EXTINF:{self.segment_duration:.3f},')
+            lines.append(f'seg/{sequence}.ts')
+        if self.end_after is not None and count >= self.end_after:
+            lines.append('#EXT-X-ENDLIST')
+        return '\n'.join(lines) + '\n'
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        if self.path == '/master.m3u8':
+            body = ('#EXTM3U\n'
+                    '#EXT-X-STREAM-INF:BANDWIDTH=400000\nlow/media.m3u8\n'
+                    '#EXT-X-STREAM-INF:BANDWIDTH=2000000\nmedia.m3u8\n').encode()
+            return self._send(200, body, 'application/vnd.apple.mpegurl')
+        if server.should_fail():
+            return self._send(500, b'fixture error', 'text/plain')
+        if self.path in ('/media.m3u8', '/low/media.m3u8'):
+            body = server.media_playlist().encode()
+            return self._send(200, body, 'application/vnd.apple.mpegurl')
+        if self.path.startswith('/seg/') and self.path.endswith('.ts'):
+            sequence = int(self.path[len('/seg/'):-len('.ts')])
+            if sequence >= server.available():
+                return self._send(404, b'not yet', 'text/plain')
+            return self._send(200, make_segment(sequence), 'video/mp2t')
+        self._send(404, b'not found', 'text/plain')
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ProgressLog:
+    def __init__(self):
+        self.downloading = []
+        self.finished_files = []
+        self.done = 0
+
+    def __call__(self, d):
+        if d['status'] == 'downloading':
+            assert d.get('is_live') and d.get('total_bytes') is None
+            self.downloading.append(d['captured_seconds'])
+        elif d['status'] == 'item_finished':
+            self.finished_files.append(d['filename'])
+        elif d['status'] == 'finished':
+            self.done += 1
+
+
+def verify(result, progress, segment_time, retention):
+    """Periksa hasil capture di disk. Return list pesan gagal (kosong = lolos)."""
+    problems = []
+    folder = result['folder']
+    files = sorted(name for name in os.listdir(folder) if name.startswith('seg-'))
+    if any(name.endswith('.part') for name in files):
+        problems.append(f"file .part tersisa: {files}")
+
+    with open(os.path.join(folder, INDEX_FILENAME), encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    indexed = [line.split("'")[1] for line in lines if line.startswith('file ')]
+    durations = [float(line.split()[1]) for line in lines if line.startswith('duration ')]
+    if indexed != files:
+        problems.append(f"index {indexed} != file di disk {files}")
+
+    sequences = []
+    for name in files:
+        sequences.extend(segment_sequences(os.path.join(folder, name)))
+    if len(set(sequences)) != len(sequences):
+        problems.append("segmen HLS terduplikasi")
+    if sequences != sorted(sequences):
+        problems.append("urutan segmen HLS tidak naik")
+    missing = (sequences[-1] - sequences[0] + 1 - len(sequences)) if sequences else 0
+    if missing > result['gaps']:
+        problems.append(f"{missing} segmen hilang, hanya {result['gaps']} gap dilaporkan")
+
+    if retention is not None and files:
+        # Segmen tertua yang tersisa masih (sebagian) berada dalam window retention
+        kept = sum(durations[:-1])
+        if kept > retention + segment_time:
+            problems.append(f"retention dilanggar: {kept:.1f} dtk tersimpan")
+    if progress.downloading != sorted(progress.downloading):
+        problems.append("captured_seconds tidak monoton naik")
+    if progress.done != 1:
+        problems.append(f"status 'finished' dilaporkan {progress.done}x")
+    # Satu item_finished per segmen yang pernah ditutup, termasuk yang sudah dibuang retention
+    rotated = int(files[-1][len('seg-'):len('seg-00000')]) if files else 0
+    if len(progress.finished_files) != rotated:
+        problems.append(f"item_finished {len(progress.finished_files)}x, segmen ditutup {rotated}")
+    # Path item_finished harus path final file segmen yang ada di disk
+    reported = {os.path.basename(path) for path in progress.finished_files}
+    unreported = [name for name in files if name not in reported]
+    if unreported:
+        problems.append(f"segmen tanpa item_finished dengan path final: {unreported}")
+    return problems
+
+
+def run_scenario(name, server, entry, segment_time, retention=None, max_duration=None,
+                 cancel_after=None):
+    server.restart()
+    progress = ProgressLog()
+    cancel = threading.Event()
+    if cancel_after:
+        threading.Timer(cancel_after, cancel.set).start()
+    with tempfile.TemporaryDirectory() as folder:
+        capture = LiveCapture(
+            f"{server.url}/{entry}", folder, segment_time=segment_time, retention=retention,
+            max_duration=max_duration, progress_hook=progress, cancel_event=cancel,
+            info_dict={'id': name, 'title': name}, remux=False,
+        )
+        start = time.perf_counter()
+        result = capture.run()
+        elapsed = time.perf_counter() - start
+        problems = verify(result, progress, segment_time, retention)
+
+    status = "OK" if not problems else "GAGAL"
+    print(f"{name:<12}{status:>6}{elapsed:>8.1f}{result['segments']:>8}{result['seconds']:>8.1f}"
+          f"{result['gaps']:>6}{server.errors:>8}  {result['reason']}")
+    for problem in problems:
+        print(f"    - {problem}")
+    return not problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--segment-duration', type=float, default=1.0, metavar='DTK',
+                        help='durasi satu segmen HLS (default: 1.0)')
+    parser.add_argument('--window', type=int, default=6, help='jumlah segmen di playlist (default: 6)')
+    parser.add_argument('--error-rate', type=float, default=0.1,
+                        help='peluang HTTP 500 per request untuk skenario error (default: 0.1)')
+    parser.add_argument('--serve', action='store_true', help='hanya jalankan server fixture')
+    args = parser.parse_args()
+
+    d = args.segment_duration
+    if args.serve:
+        server = LiveServer(d, args.window)
+        print(f"Live HLS: {server.url}/media.m3u8 (master: {server.url}/master.m3u8)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    servers = {
+        'live': LiveServer(d, args.window),
+        'ended': LiveServer(d, args.window, end_after=args.window + 4),
+        'error': LiveServer(d, args.window, error_rate=args.error_rate, seed=1),
+    }
+    for server in servers.values():
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f"{'skenario':<12}{'hasil':>6}{'waktu':>8}{'segmen':>8}{'media':>8}{'gap':>6}{'error':>8}  alasan")
+    results = [
+        run_scenario('max', servers['live'], 'media.m3u8', 3 * d, max_duration=8 * d),
+        run_scenario('retention', servers['live'], 'media.m3u8', 2 * d, retention=4 * d, max_duration=10 * d),
+        run_scenario('master', servers['live'], 'master.m3u8', 3 * d, max_duration=5 * d),
+        run_scenario('endlist', servers['ended'], 'media.m3u8', 3 * d),
+        run_scenario('cancel', servers['live'], 'media.m3u8', 2 * d, cancel_after=4 * d),
+        run_scenario('error', servers['error'], 'media.m3u8', 3 * d, max_duration=8 * d),
+    ]
+    for server in servers.values():
+        server.shutdown()
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
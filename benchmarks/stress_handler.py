@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Regression & load harness: YouTubeHandler dipakai banyak thread sekaligus.
+
+Server HTTP lokal menyajikan file media sintetis (`/v/<id>.mp4`, isi
+deterministik per id, mendukung Range) dengan gangguan yang disuntikkan:
+latency per request, stall di tengah body, HTTP 503, dan koneksi yang
+diputus sebelum body selesai. Setiap job meniru alur GUI/CLI: fetch info
+(`get_info_summary`) lalu download, dengan retry job seperti user yang
+menekan download lagi.
+
+Untuk setiap jumlah worker, semua job dijalankan lalu diperiksa:
+
+- tidak ada file hilang: setiap id punya tepat satu file media dengan isi benar
+- tidak ada duplikat: tidak ada file media lain, `item_finished` sekali per id
+  dan path-nya menunjuk ke file final
+- tidak ada sisa `.part` di luar folder staging
+- tidak ada deadlock: jika run melewati `--deadline`, stack semua thread
+  dicetak dan harness keluar dengan gagal
+
+Hasil berupa kurva throughput (job/s, MB/s, speedup, efisiensi, latency
+p50/p95) per jumlah worker, untuk melihat titik di mana menambah worker
+tidak lagi membantu.
+
+    python benchmarks/stress_handler.py [--workers 1,2,4,8,16,32,64] [--jobs 128]
+    python benchmarks/stress_handler.py --handler per-job --error-rate 0.1
+    python benchmarks/stress_handler.py --handler supervisor --workers 1,2,4 --jobs 32
+
+Mode `supervisor` menjalankan download di worker subprocess (seperti
+`--isolate` dan GUI): beberapa proses menulis ke folder output dan staging
+yang sama secara bersamaan.
+"""
+
+import os
+import sys
+import time
+import random
+import hashlib
+import argparse
+import tempfile
+import threading
+import faulthandler
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from downloader import YouTubeHandler
+from supervisor import DownloadSupervisor
+from writer import STAGING_DIRNAME
+
+CHUNK = 16 * 1024
+
+
+def media_bytes(video_id, size):
+    """Isi file sintetis yang deterministik per id."""
+    block = hashlib.sha256(video_id.encode()).digest() * (CHUNK // 32)
+    return (block * (size // len(block) + 1))[:size]
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, size, latency=0.0, stall_rate=0.0, stall=0.0, error_rate=0.0,
+                 drop_rate=0.0, seed=0):
+        self.size = size
+        self.latency = latency
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.bodies = {}
+        self.counters = Counter()
+        super().__init__(('127.0.0.1', 0), Handler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def handle_error(self, request, client_address):
+        # Klien yang menutup koneksi lebih awal bukan temuan
+        pass
+
+    def body(self, video_id):
+        with self.lock:
+            if video_id not in self.bodies:
+                self.bodies[video_id] = media_bytes(video_id, self.size)
+            return self.bodies[video_id]
+
+    def roll(self, name, rate):
+        """True dengan peluang `rate`; dihitung di counters jika terjadi."""
+        if not rate:
+            return False
+        with self.lock:
+            hit = self.random.random() < rate
+            if hit:
+                self.counters[name] += 1
+        return hit
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def do_GET(self):
+        self._serve(head=False)
+
+    def _serve(self, head):
+        server = self.server
+        with server.lock:
+            server.counters['requests'] += 1
+        if server.latency:
+            time.sleep(server.latency)
+        if not (self.path.startswith('/v/') and self.path.endswith('.mp4')):
+            return self._error(404)
+        if server.roll('errors', server.error_rate):
+            return self._error(503)
+
+        body = server.body(self.path[len('/v/'):-len('.mp4')])
+        start = 0
+        spec = self.headers.get('Range')
+        if spec and spec.startswith('bytes='):
+            start = int(spec[len('bytes='):].split('-')[0] or 0)
+            if start >= len(body):
+                return self._error(416)
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'video/mp4')
+        self.send_header('Content-Length', str(len(body) - start))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+        if head:
+            return
+
+        remaining = body[start:]
+        # Gangguan di tengah body: stall sementara, atau koneksi diputus
+        cut = len(remaining) // 2
+        stall = server.roll('stalls', server.stall_rate)
+        drop = server.roll('drops', server.drop_rate)
+        try:
+            for offset in range(0, len(remaining), CHUNK):
+                if offset >= cut and (stall or drop):
+                    if drop:
+                        self.close_connection = True
+                        return
+                    time.sleep(server.stall)
+                    stall = False
+                self.wfile.write(remaining[offset:offset + CHUNK])
+        except (BrokenPipeError, ConnectionResetError):
+            # Ekstraksi generic hanya membaca awal body lalu menutup koneksi
+            self.close_connection = True
+
+    def _error(self, status):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class QuietLogger:
+    """Logger yt-dlp tanpa output; error job sudah dilaporkan lewat return value."""
+
+    def debug(self, msg):
+        pass
+
+    info = warning = error = debug
+
+
+def make_handler(supervisor=None):
+    handler = YouTubeHandler(supervisor)
+    handler.ydl_opts['logger'] = QuietLogger()
+    return handler
+
+
+class JobLog:
+    """Event progress yang relevan dari semua job (thread-safe)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.finished = []      # (id, path) dari item_finished
+
+    def hook(self, d):
+        if d.get('status') == 'item_finished':
+            info_dict = d.get('info_dict') or {}
+            with self.lock:
+                self.finished.append((info_dict.get('id'), d.get('filename')))
+
+
+def run_job(handler_for, url, video_id, output_dir, log, attempts):
+    """Fetch info lalu download, diulang sampai file ada. Return (detik, percobaan, error)."""
+    started = time.perf_counter()
+    error = None
+    for attempt in range(1, attempts + 1):
+        handler = handler_for()
+        summary, error = handler.get_info_summary(url)
+        if summary is None:
+            continue
+        if summary.id != video_id:
+            return time.perf_counter() - started, attempt, f"id salah: {summary.id}"
+        options = {
+            'outtmpl': os.path.join(output_dir, '%(title)s [%(id)s]', '%(title)s [%(id)s].%(ext)s'),
+            'noprogress': True,
+            'logger': QuietLogger(),
+        }
+        try:
+            success, error = handler.download(url, options, log.hook)
+        except Exception as e:
+            # download() seharusnya tidak pernah raise; tetap dicatat sebagai temuan
+            return time.perf_counter() - started, attempt, f"exception: {e!r}"
+        target = os.path.join(output_dir, f"{video_id} [{video_id}]", f"{video_id} [{video_id}].mp4")
+        if success and os.path.exists(target):
+            return time.perf_counter() - started, attempt, None
+        error = error if not success else "file tidak ada setelah download"
+    return time.perf_counter() - started, attempts, error
+
+
+def verify(output_dir, ids, size, log, job_errors):
+    """Return list masalah: file hilang/duplikat/rusak, sisa .part, event ganda."""
+    problems = [f"{video_id}: gagal setelah retry ({error})" for video_id, error in job_errors.items()]
+    expected = {video_id: media_bytes(video_id, size) for video_id in ids}
+
+    media = Counter()
+    for root, dirs, files in os.walk(output_dir):
+        if STAGING_DIRNAME in dirs:
+            dirs.remove(STAGING_DIRNAME)
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith('.part'):
+                problems.append(f"sisa .part di luar staging: {path}")
+            elif name.endswith('.mp4'):
+                video_id = name.rsplit('[', 1)[-1].split(']')[0]
+                media[video_id] += 1
+                if video_id not in expected:
+                    problems.append(f"file tak dikenal: {path}")
+                    continue
+                with open(path, 'rb') as f:
+                    if f.read() != expected[video_id]:
+                        problems.append(f"isi rusak: {path}")
+
+    for video_id in ids:
+        if media[video_id] == 0 and video_id not in job_errors:
+            problems.append(f"{video_id}: file hilang")
+        elif media[video_id] > 1:
+            problems.append(f"{video_id}: {media[video_id]} file media (duplikat)")
+
+    staging = os.path.join(output_dir, STAGING_DIRNAME)
+    if not job_errors and os.path.exists(staging):
+        leftover = [os.path.join(root, name) for root, _, files in os.walk(staging) for name in files]
+        problems.append(f"folder staging tidak dibersihkan ({len(leftover)} file tersisa)")
+
+    reported = Counter(video_id for video_id, _ in log.finished)
+    for video_id, count in reported.items():
+        if count > 1:
+            problems.append(f"{video_id}: item_finished {count}x")
+    for video_id, path in log.finished:
+        if not path or not os.path.exists(path):
+            problems.append(f"{video_id}: item_finished menunjuk ke file yang tidak ada ({path})")
+    return problems
+
+
+def run_round(server, workers, jobs, handler_mode, attempts, deadline):
+    ids = [f"w{workers:02d}j{index:04d}" for index in range(jobs)]
+    log = JobLog()
+    supervisor = DownloadSupervisor(max_workers=workers) if handler_mode == 'supervisor' else None
+    shared = make_handler(supervisor)
+    handler_for = make_handler if handler_mode == 'per-job' else (lambda: shared)
+    server.counters.clear()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='stress')
+        futures = {
+            pool.submit(run_job, handler_for, f"{server.url}/v/{video_id}.mp4", video_id,
+                        output_dir, log, attempts): video_id
+            for video_id in ids
+        }
+        done, pending = wait(futures, timeout=deadline)
+        elapsed = time.perf_counter() - start
+        if pending:
+            print(f"\nDEADLOCK? {len(pending)} job belum selesai setelah {deadline:.0f} dtk "
+                  f"({workers} worker). Stack semua thread:\n", file=sys.stderr)
+            faulthandler.dump_traceback(file=sys.stderr, all_threads=True)
+            # Thread yang macet tidak bisa dihentikan; keluar paksa
+            os._exit(2)
+        pool.shutdown()
+        if supervisor is not None:
+            supervisor.shutdown()
+
+        latencies = []
+        retried = 0
+        job_errors = {}
+        for future, video_id in futures.items():
+            seconds, attempt, error = future.result()
+            latencies.append(seconds)
+            retried += attempt > 1
+            if error:
+                job_errors[video_id] = error
+        problems = verify(output_dir, ids, server.size, log, job_errors)
+
+    latencies.sort()
+    return {
+        'workers': workers,
+        'elapsed': elapsed,
+        'jobs_per_second': jobs / elapsed,
+        'mb_per_second': jobs * server.size / elapsed / 1e6,
+        'p50': latencies[len(latencies) // 2],
+        'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        'retried': retried,
+        'injected': dict(server.counters),
+        'problems': problems,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', default='1,2,4,8,16,32,64',
+                        help='daftar jumlah worker, pisahkan dengan koma (default: 1,2,4,8,16,32,64)')
+    parser.add_argument('--jobs', type=int, default=128, help='job per jumlah worker (default: 128)')
+    parser.add_argument('--size', type=int, default=512, metavar='KB', help='ukuran file media (default: 512 KB)')
+    parser.add_argument('--handler', choices=['shared', 'per-job', 'supervisor'], default='shared',
+                        help='satu YouTubeHandler untuk semua thread (seperti main.py), '
+                             'satu per job (seperti thread GUI), atau download di worker '
+                             'subprocess (seperti --isolate)')
+    parser.add_argument('--latency', type=float, default=20, metavar='MS', help='latency per request (default: 20 ms)')
+    parser.add_argument('--stall-rate', type=float, default=0.05, help='peluang stall di tengah body (default: 0.05)')
+    parser.add_argument('--stall', type=float, default=0.5, metavar='DTK', help='lama stall (default: 0.5 dtk)')
+    parser.add_argument('--error-rate', type=float, default=0.03, help='peluang HTTP 503 per request (default: 0.03)')
+    parser.add_argument('--drop-rate', type=float, default=0.03,
+                        help='peluang koneksi diputus di tengah body (default: 0.03)')
+    parser.add_argument('--attempts', type=int, default=5, help='percobaan per job (default: 5)')
+    parser.add_argument('--deadline', type=float, default=300, metavar='DTK',
+                        help='batas waktu per jumlah worker sebelum dianggap deadlock (default: 300)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = FixtureServer(
+        args.size * 1024, latency=args.latency / 1000, stall_rate=args.stall_rate, stall=args.stall,
+        error_rate=args.error_rate, drop_rate=args.drop_rate, seed=args.seed,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f"{args.jobs} job x {args.size} KB, handler {args.handler}, latency {args.latency:.0f} ms, "
+          f"stall {args.stall_rate:.0%}, 503 {args.error_rate:.0%}, putus {args.drop_rate:.0%}")
+    print(f"{'worker':>6}{'waktu':>8}{'job/s':>8}{'MB/s':>8}{'speedup':>9}{'efisiensi':>11}"
+          f"{'p50':>7}{'p95':>7}{'retry':>7}  gangguan")
+
+    results = []
+    failed = False
+    for workers in (int(value) for value in args.workers.split(',')):
+        result = run_round(server, workers, args.jobs, args.handler, args.attempts, args.deadline)
+        base = results[0] if results else result
+        speedup = result['jobs_per_second'] / base['jobs_per_second']
+        efficiency = speedup / (workers / base['workers'])
+        injected = ', '.join(f"{key} {value}" for key, value in sorted(result['injected'].items()))
+        print(f"{workers:>6}{result['elapsed']:>8.1f}{result['jobs_per_second']:>8.1f}"
+              f"{result['mb_per_second']:>8.1f}{speedup:>8.1f}x{efficiency:>10.0%}"
+              f"{result['p50']:>7.2f}{result['p95']:>7.2f}{result['retried']:>7}  {injected}")
+        for problem in result['problems'][:20]:
+            print(f"    - {problem}")
+        if len(result['problems']) > 20:
+            print(f"    ... dan {len(result['problems']) - 20} masalah lain")
+        failed = failed or bool(result['problems'])
+        results.append(result)
+
+    # Titik jenuh: worker pertama yang menambah throughput < 10% dari langkah sebelumnya
+    for previous, current in zip(results, results[1:]):
+        if current['jobs_per_second'] < previous['jobs_per_second'] * 1.1:
+            print(f"\nTitik jenuh: sekitar {previous['workers']} worker "
+                  f"({previous['jobs_per_second']:.1f} job/s); {current['workers']} worker "
+                  f"hanya {current['jobs_per_second']:.1f} job/s")
+            break
+    else:
+        print("\nThroughput masih naik sampai jumlah worker terbesar yang diuji")
+
+    server.shutdown()
+    print("\nHASIL:", "GAGAL" if failed else "OK (tidak ada file hilang/duplikat, tidak ada deadlock)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+"""
+Mode capture untuk live stream dan siaran panjang (HLS).
+
+Download biasa menganggap setiap URL adalah file berhingga. Untuk live
+stream, media playlist HLS di-poll sendiri dan setiap segmen baru langsung
+ditulis ke file segmen bergulir berdurasi tetap:
+
+    <folder>/seg-00001.ts        segmen yang sudah ditutup
+    <folder>/seg-00002.ts.part   segmen yang sedang ditulis
+    <folder>/capture.ffconcat    index segmen yang sudah ditutup
+
+MPEG-TS tidak butuh trailer, jadi file `.part` pun sudah bisa diputar.
+Jika ffmpeg tersedia, setiap segmen yang ditutup di-remux ke MP4 di
+background (tanpa re-encode), sehingga capture yang terputus kapan pun
+tetap berisi file siap pakai. Semua segmen bisa digabung dengan
+`ffmpeg -f concat -i capture.ffconcat -c copy hasil.mp4`.
+
+Opsional: retention window (segmen lama dihapus) dan durasi maksimum.
+Progress dilaporkan berdasarkan durasi media & bitrate, karena live
+stream tidak punya `total_bytes`.
+"""
+
+import os
+import re
+import time
+import shutil
+import tempfile
+import threading
+import subprocess
+import urllib.request
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+
+import transport
+
+DEFAULT_SEGMENT_TIME = 300
+LIVE_EDGE_SEGMENTS = 3       # mulai dari 3 segmen terakhir, seperti player HLS
+MAX_PLAYLIST_ERRORS = 5
+SEGMENT_RETRIES = 3
+TIMEOUT = 30
+INDEX_FILENAME = 'capture.ffconcat'
+
+_ATTR_RE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^",]*)')
+
+
+def live_format(height=None):
+    """Format selector yt-dlp untuk stream HLS muxed (video+audio dalam satu playlist)."""
+    if height:
+        return f"best[protocol^=m3u8][height<={height}]/best[protocol^=m3u8]"
+    return "best[protocol^=m3u8]"
+
+
+def _attributes(line):
+    return {key: value.strip('"') for key, value in _ATTR_RE.findall(line.split(':', 1)[1])}
+
+
+class MediaPlaylist:
+    """Hasil parse satu playlist HLS (master atau media)."""
+
+    def __init__(self):
+        self.variants = []      # (bandwidth, url) untuk master playlist
+        self.segments = []      # (sequence, durasi, url)
+        self.target_duration = 6.0
+        self.init_url = None    # EXT-X-MAP (fMP4)
+        self.ended = False
+        self.encrypted = False
+
+    @classmethod
+    def parse(cls, text, base_url):
+        playlist = cls()
+        sequence = 0
+        duration = None
+        bandwidth = None
+        for raw in text.splitlines():
+            line = raw.strip()
+            if not line:
+                continue
+            if line.startswith('#EXT-X-STREAM-INF'):
+                bandwidth = int(_attributes(line).get('BANDWIDTH') or 0)
+            elif line.startswith('#EXT-X-TARGETDURATION'):
+                playlist.target_duration = float(line.split(':', 1)[1])
+            elif line.startswith('#EXT-X-MEDIA-SEQUENCE'):
+                sequence = int(line.split(':', 1)[1])
+            elif line.startswith('#EXTINF'):
+                duration = float(line.split(':', 1)[1].split(',')[0])
+            elif line.startswith('#EXT-X-MAP'):
+                playlist.init_url = urljoin(base_url, _attributes(line)['URI'])
+            elif line.startswith('#EXT-X-KEY'):
+                if _attributes(line).get('METHOD', 'NONE') != 'NONE':
+                    playlist.encrypted = True
+            elif line.startswith('#EXT-X-ENDLIST'):
+                playlist.ended = True
+            elif line.startswith('#'):
+                continue
+            elif bandwidth is not None:
+                playlist.variants.append((bandwidth, urljoin(base_url, line)))
+                bandwidth = None
+            elif duration is not None:
+                playlist.segments.append((sequence, duration, urljoin(base_url, line)))
+                sequence += 1
+                duration = None
+        return playlist
+
+    @property
+    def last_sequence(self):
+        return self.segments[-1][0] if self.segments else None
+
+
+class _Client:
+    """GET lewat pool koneksi bersama (transport.py), fallback ke urllib."""
+
+    def __init__(self, headers=None):
+        self.headers = dict(headers or {})
+        self.pool = transport.pool_manager()
+
+    def get(self, url):
+        if self.pool is not None:
+            response = self.pool.request('GET', url, headers=self.headers, timeout=TIMEOUT, retries=2)
+            if response.status >= 400:
+                raise OSError(f"HTTP {response.status}")
+            return response.data
+        request = urllib.request.Request(url, headers=self.headers)
+        with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+            return response.read()
+
+
+class Segment:
+    __slots__ = ('index', 'path', 'start', 'duration', 'size')
+
+    def __init__(self, index, path, start):
+        self.index = index
+        self.path = path
+        self.start = start
+        self.duration = 0.0
+        self.size = 0
+
+
+class RollingWriter:
+    """Tulis data media ke file segmen berdurasi tetap, dengan retention & remux.
+
+    `on_finished(segment)` dipanggil sekali per segmen setelah file finalnya
+    ada: setelah remux ke MP4 (dari thread remux), atau langsung saat segmen
+    ditutup jika tidak di-remux.
+    """
+
+    def __init__(self, folder, segment_time=DEFAULT_SEGMENT_TIME, retention=None, remux=True,
+                 on_finished=None):
+        self.folder = folder
+        self.segment_time = segment_time
+        self.retention = retention
+        self.ffmpeg = shutil.which('ffmpeg') if remux else None
+        self.on_finished = on_finished
+        self.extension = '.ts'
+        self.init_data = None
+        self.closed = []
+        self.current = None
+        self.media_time = 0.0
+        self._file = None
+        self._count = 0
+        self._lock = threading.Lock()
+        self._remuxer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='capture-remux') if self.ffmpeg else None
+        os.makedirs(folder, exist_ok=True)
+
+    def set_init(self, data):
+        """Init segment fMP4 (EXT-X-MAP): ditulis di awal setiap file segmen."""
+        self.init_data = data
+        # fMP4 init + fragment sudah MP4 yang valid, tidak perlu remux
+        self.extension = '.mp4'
+
+    def write(self, data, duration):
+        """Tulis data satu segmen HLS. Return Segment jika file segmen baru saja ditutup."""
+        if self._file is None:
+            self._open()
+        self._file.write(data)
+        self.current.size += len(data)
+        self.current.duration += duration
+        self.media_time += duration
+        if self.current.duration >= self.segment_time:
+            return self.rotate()
+        return None
+
+    def _open(self):
+        self._count += 1
+        path = os.path.join(self.folder, f"seg-{self._count:05d}{self.extension}")
+        self.current = Segment(self._count, path, self.media_time)
+        self._file = open(path + '.part', 'wb')
+        if self.init_data:
+            self._file.write(self.init_data)
+
+    def rotate(self):
+        """Tutup segmen saat ini: rename atomik, update index, remux & retention."""
+        if self._file is None:
+            return None
+        self._file.close()
+        self._file = None
+        segment = self.current
+        self.current = None
+        os.replace(segment.path + '.part', segment.path)
+        with self._lock:
+            self.closed.append(segment)
+            self._apply_retention()
+            self._write_index()
+            kept = segment in self.closed
+        if self._remuxer is not None and segment.path.endswith('.ts'):
+            self._remuxer.submit(self._remux, segment)
+        elif kept:
+            self._finished(segment)
+        return segment
+
+    def _remux(self, segment):
+        source = segment.path
+        target = source[:-len('.ts')] + '.mp4'
+        tmp_path = target + '.tmp'
+        result = subprocess.run(
+            [self.ffmpeg, '-y', '-loglevel', 'error', '-i', source, '-c', 'copy',
+             '-movflags', '+faststart', '-f', 'mp4', tmp_path],
+            capture_output=True,
+        )
+        with self._lock:
+            kept = segment in self.closed
+            if result.returncode != 0 or not kept:
+                # Gagal, atau segmen sudah dibuang retention: tetap pakai .ts
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, target)
+                segment.path = target
+                os.remove(source)
+                self._write_index()
+        if kept:
+            self._finished(segment)
+
+    def _finished(self, segment):
+        if self.on_finished is not None:
+            self.on_finished(segment)
+
+    def _apply_retention(self):
+        if not self.retention:
+            return
+        while self.closed and self.media_time - (self.closed[0].start + self.closed[0].duration) > self.retention:
+            segment = self.closed.pop(0)
+            if os.path.exists(segment.path):
+                os.remove(segment.path)
+
+    def _write_index(self):
+        lines = ['ffconcat version 1.0']
+        for segment in self.closed:
+            lines.append(f"file '{os.path.basename(segment.path)}'")
+            lines.append(f"duration {segment.duration:.3f}")
+        fd, tmp_path = tempfile.mkstemp(prefix='.capture.', dir=self.folder)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, os.path.join(self.folder, INDEX_FILENAME))
+
+    def close(self):
+        self.rotate()
+        if self._remuxer is not None:
+            self._remuxer.shutdown(wait=True)
+
+
+class LiveCapture:
+    """Poll media playlist HLS dan tulis segmen baru lewat RollingWriter."""
+
+    def __init__(self, url, folder, segment_time=DEFAULT_SEGMENT_TIME, retention=None,
+                 max_duration=None, headers=None, progress_hook=None, cancel_event=None,
+                 info_dict=None, remux=True):
+        self.url = url
+        self.writer = RollingWriter(folder, segment_time, retention, remux, on_finished=self._on_segment)
+        self.max_duration = max_duration
+        self.client = _Client(headers)
+        self.progress_hook = progress_hook
+        self.cancel_event = cancel_event or threading.Event()
+        self.info_dict = info_dict or {}
+        self.bytes = 0
+        self.gaps = 0
+        self.started_at = None
+        self.stop_reason = None
+
+    def _fetch_playlist(self, url):
+        text = self.client.get(url).decode('utf-8', 'replace')
+        return MediaPlaylist.parse(text, url)
+
+    def _media_url(self):
+        playlist = self._fetch_playlist(self.url)
+        if playlist.variants:
+            # Master playlist: pilih varian dengan bandwidth tertinggi
+            return max(playlist.variants)[1]
+        return self.url
+
+    def _fetch_segment(self, url):
+        for attempt in range(SEGMENT_RETRIES):
+            try:
+                return self.client.get(url)
+            except Exception:
+                if attempt == SEGMENT_RETRIES - 1:
+                    return None
+                time.sleep(0.5 * (attempt + 1))
+
+    def _report(self, status, **fields):
+        if not self.progress_hook:
+            return
+        elapsed = time.monotonic() - self.started_at
+        captured = self.writer.media_time
+        current = self.writer.current
+        self.progress_hook({
+            'status': status,
+            'is_live': True,
+            'downloaded_bytes': self.bytes,
+            'total_bytes': None,
+            'elapsed': elapsed,
+            'speed': self.bytes / elapsed if elapsed > 0 else None,
+            'captured_seconds': captured,
+            'max_duration': self.max_duration,
+            'bitrate': self.bytes * 8 / captured if captured > 0 else None,
+            'segment_index': current.index if current else self.writer._count,
+            'filename': current.path + '.part' if current else None,
+            'info_dict': self.info_dict,
+            **fields,
+        })
+
+    def run(self):
+        """Capture sampai stream berakhir, dibatalkan, atau durasi maksimum. Return dict hasil."""
+        self.started_at = time.monotonic()
+        media_url = self._media_url()
+        last_sequence = None
+        errors = 0
+        init_url = None
+
+        try:
+            while not self.cancel_event.is_set():
+                try:
+                    playlist = self._fetch_playlist(media_url)
+                    errors = 0
+                except Exception:
+                    errors += 1
+                    if errors >= MAX_PLAYLIST_ERRORS:
+                        raise
+                    self.cancel_event.wait(1.0 * errors)
+                    continue
+                if playlist.encrypted:
+                    raise OSError("Stream terenkripsi (EXT-X-KEY) tidak didukung mode capture")
+
+                segments = playlist.segments
+                if last_sequence is not None and playlist.last_sequence is not None \
+                        and playlist.last_sequence < last_sequence:
+                    # Media sequence mundur: stream di-restart
+                    last_sequence = None
+                if last_sequence is None:
+                    if not playlist.ended:
+                        segments = segments[-LIVE_EDGE_SEGMENTS:]
+                else:
+                    if segments and segments[0][0] > last_sequence + 1:
+                        # Segmen sudah keluar dari window playlist sebelum sempat diambil
+                        self.gaps += segments[0][0] - last_sequence - 1
+                    segments = [s for s in segments if s[0] > last_sequence]
+
+                if playlist.init_url and playlist.init_url != init_url:
+                    init_url = playlist.init_url
+                    self.writer.set_init(self.client.get(init_url))
+
+                for sequence, duration, url in segments:
+                    if self.cancel_event.is_set():
+                        break
+                    data = self._fetch_segment(url)
+                    last_sequence = sequence
+                    if data is None:
+                        self.gaps += 1
+                        continue
+                    self.bytes += len(data)
+                    self.writer.write(data, duration)
+                    self._report('downloading')
+                    if self.max_duration and self.writer.media_time >= self.max_duration:
+                        self.stop_reason = 'max_duration'
+                        return self._finish()
+
+                if playlist.ended:
+                    self.stop_reason = 'ended'
+                    return self._finish()
+                # Spesifikasi HLS: reload setelah target duration, setengahnya jika belum ada segmen baru
+                wait = playlist.target_duration if segments else playlist.target_duration / 2
+                self.cancel_event.wait(wait)
+
+            self.stop_reason = 'cancelled'
+            return self._finish()
+        finally:
+            # Segmen terakhir tetap ditutup (dan bisa dipakai) walau terjadi error
+            self.writer.close()
+
+    def _on_segment(self, segment):
+        # Path final segmen (.mp4 setelah remux, atau .ts)
+        self._report('item_finished', filename=segment.path)
+
+    def _finish(self):
+        # Menunggu remux selesai, jadi semua item_finished terkirim sebelum 'finished'
+        self.writer.close()
+        self._report('finished')
+        return {
+            'folder': self.writer.folder,
+            'segments': len(self.writer.closed),
+            'seconds': self.writer.media_time,
+            'bytes': self.bytes,
+            'gaps': self.gaps,
+            'reason': self.stop_reason,
+            'index': os.path.join(self.writer.folder, INDEX_FILENAME),
+        }
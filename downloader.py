@@ -1,20 +1,87 @@
 import yt_dlp
+from yt_dlp.utils import PagedList
+from urllib.parse import urlsplit
 import os
+import re
+import time
 import ssl
 import certifi
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from summary import InfoSummary
+from ladder import FormatLadder, PlaylistLadder
+from writer import OutputWriter
+from capture import LiveCapture, DEFAULT_SEGMENT_TIME, live_format
+import transport
 
 # Setup SSL certificates untuk PyInstaller builds
 os.environ['SSL_CERT_FILE'] = certifi.where()
 os.environ['REQUESTS_CA_BUNDLE'] = certifi.where()
 
+# Pool koneksi keep-alive, cache DNS & resumption TLS bersama untuk
+# semua instance YoutubeDL di proses ini (lihat transport.py)
+transport.install()
+
+# Host yang hampir pasti dipakai untuk ekstraksi metadata
+WARM_UP_URLS = ('https://www.youtube.com/',)
+
+# Job entry playlist yang di-submit bersamaan ke supervisor. Policy scheduler
+# memilih di antara job ini; yang berjalan tetap dibatasi max_workers.
+SCHEDULE_WINDOW = 64
+
+# "ERROR: [youtube] <id>: pesan" -> id item yang gagal
+ITEM_ERROR_RE = re.compile(r'^ERROR: \[[^\]]+\] ([^\s:]+): ')
+
+
+class _ItemErrorLogger:
+    """Logger yt-dlp yang mencatat error per item.
+
+    Dengan `ignoreerrors`, yt-dlp hanya menulis error lalu lanjut ke item
+    berikutnya; logger ini meneruskannya ke `on_error` agar kegagalan tidak
+    hilang. Pesan lain diteruskan ke logger milik user jika ada.
+    """
+
+    def __init__(self, on_error, inner=None):
+        self.on_error = on_error
+        self.inner = inner
+
+    def debug(self, msg):
+        if self.inner:
+            self.inner.debug(msg)
+
+    def info(self, msg):
+        if self.inner and hasattr(self.inner, 'info'):
+            self.inner.info(msg)
+
+    def warning(self, msg):
+        if self.inner:
+            self.inner.warning(msg)
+
+    def error(self, msg):
+        if msg.startswith('ERROR:'):
+            self.on_error(msg)
+        if self.inner:
+            self.inner.error(msg)
+
+
 class YouTubeHandler:
-    def __init__(self):
+    def __init__(self, supervisor=None):
+        # Jika diberikan, download dijalankan di worker subprocess (lihat supervisor.py)
+        self.supervisor = supervisor
+        # Callable judul -> prioritas job untuk download_entries (lihat scheduler.TitlePriority)
+        self.priority = None
+        self._cancel_event = threading.Event()
         self.ydl_opts = {
             'quiet': True,
             'no_warnings': True,
             'nocheckcertificate': False,  # Tetap verifikasi tapi gunakan certifi
         }
 
+    def warm_up(self, urls=WARM_UP_URLS):
+        """Buka koneksi ke host YouTube di background sebelum dibutuhkan."""
+        return transport.warm_up(urls)
+
     def get_video_info(self, url):
         """Mengambil metadata video tanpa download."""
         # Gunakan extract_flat untuk playlist agar lebih cepat
@@ -31,8 +98,109 @@ class YouTubeHandler:
             except Exception as e:
                 return None, str(e)
 
-    def download(self, url, options, progress_hook=None):
-        """Melakukan download dengan opsi tertentu."""
+    def get_info_summary(self, url, resolve_count=True, probe_playlist=False, cancel_event=None):
+        """Seperti get_video_info, tapi return InfoSummary yang hemat memori.
+
+        Entries playlist tidak dimaterialisasi sebagai dict; jika jumlah video
+        tidak tersedia di metadata, entries dihitung sebagai EntryRef ringkas.
+        Dengan `probe_playlist`, format ladder setiap entry diambil paralel.
+        Jika `cancel_event` di-set, paging dan probe berhenti di entry berikutnya.
+        """
+        summary = None
+        try:
+            info, entries = self.open_playlist(url)
+            summary = InfoSummary(info, entries)
+            if resolve_count and summary.count is None and summary.is_playlist:
+                for _ in summary.iter_entries():
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise Exception("Dibatalkan")
+            if probe_playlist and summary.is_playlist:
+                summary.ladder = self.probe_ladders(summary.iter_entries(), cancel_event=cancel_event)
+            if cancel_event is not None and cancel_event.is_set():
+                raise Exception("Dibatalkan")
+            return summary, None
+        except Exception as e:
+            if summary is not None:
+                summary.close()
+            return None, str(e)
+
+    def probe_ladders(self, entries, max_workers=8, cancel_event=None):
+        """Bangun FormatLadder untuk setiap entry secara paralel."""
+        def probe(entry):
+            if cancel_event is not None and cancel_event.is_set():
+                raise Exception("Dibatalkan")
+            # YoutubeDL tidak thread-safe, jadi satu instance per probe
+            with yt_dlp.YoutubeDL({**self.ydl_opts, 'skip_download': True}) as ydl:
+                info = ydl.extract_info(entry.url or entry.id, download=False, process=False)
+            return FormatLadder.from_info(info)
+
+        ladders = []
+        failed = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for future in [pool.submit(probe, entry) for entry in entries]:
+                try:
+                    ladders.append(future.result())
+                except Exception:
+                    failed += 1
+        return PlaylistLadder(ladders, failed)
+
+    def open_playlist(self, url):
+        """Buka URL secara lazy: return (info, entries) tanpa enumerasi penuh.
+
+        `entries` adalah generator; halaman playlist baru diambil saat
+        di-iterasi, jadi pemanggil bisa berhenti lebih awal. Panggil
+        `entries.close()` jika tidak di-iterasi sampai habis.
+        """
+        stream = self._lazy_stream(url)
+        info = next(stream)
+        return info, stream
+
+    def _lazy_stream(self, url):
+        """Yield info utama terlebih dahulu, lalu entries satu per satu."""
+        opts = {
+            **self.ydl_opts,
+            'extract_flat': 'in_playlist',
+            'skip_download': True,
+        }
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            # process=False agar yt-dlp tidak mematerialisasi semua entries
+            info = ydl.extract_info(url, download=False, process=False)
+            # Ikuti redirect (misal URL channel -> tab /videos)
+            while info and info.get('_type') in ('url', 'url_transparent'):
+                info = ydl.extract_info(info['url'], download=False, process=False,
+                                        ie_key=info.get('ie_key'))
+            yield info
+
+            entries = info.get('entries') or []
+            if isinstance(entries, PagedList):
+                # PagedList hanya mengambil halaman yang diminta
+                start, page_size = 0, 50
+                while True:
+                    page = entries.getslice(start, start + page_size)
+                    if not page:
+                        break
+                    yield from page
+                    start += page_size
+            else:
+                yield from entries
+
+    def cancel(self):
+        """Batalkan download yang sedang berjalan di handler ini.
+
+        Berlaku permanen untuk instance ini (download berikutnya juga batal),
+        jadi buat handler baru untuk job baru.
+        """
+        self._cancel_event.set()
+
+    def download(self, url, options, progress_hook=None, job_info=None):
+        """Melakukan download dengan opsi tertentu.
+
+        `job_info` opsional (duration, filesize, uploader, priority) untuk
+        scheduler supervisor; diabaikan jika download berjalan in-process.
+        """
+        if self.supervisor is not None:
+            return self.supervisor.download(url, options, progress_hook, self._cancel_event, job_info)
+
         # Struktur folder: downloads/Judul Video [ID]/
         # File: downloads/Judul Video [ID]/Judul Video [ID].ext
         base_opts = {
@@ -47,12 +215,148 @@ class YouTubeHandler:
         # Merge options user (seperti format) dengan base options
         final_opts = {**base_opts, **options}
         
-        if progress_hook:
-            final_opts['progress_hooks'] = [progress_hook]
+        def hook(d):
+            if self._cancel_event.is_set():
+                raise Exception("Download dibatalkan")
+            if progress_hook:
+                progress_hook(d)
+
+        final_opts['progress_hooks'] = [hook]
+
+        def pp_hook(d):
+            # MoveFiles adalah post-processor terakhir: file sudah di folder output
+            if progress_hook and d.get('status') == 'finished' and d.get('postprocessor') == 'MoveFiles':
+                info_dict = d.get('info_dict') or {}
+                filepath = info_dict.get('filepath')
+                if filepath and info_dict.get('__finaldir'):
+                    # Hook menerima salinan info sebelum MoveFiles memindahkan file
+                    # dari staging, jadi petakan ke folder final
+                    filepath = os.path.join(info_dict['__finaldir'], os.path.basename(filepath))
+                progress_hook({'status': 'item_finished', 'filename': filepath,
+                               'info_dict': info_dict})
+
+        final_opts['postprocessor_hooks'] = [pp_hook]
+
+        errors = []
+
+        def on_error(message):
+            errors.append(message)
+            if progress_hook:
+                match = ITEM_ERROR_RE.match(message)
+                progress_hook({'status': 'item_error', 'message': message[len('ERROR: '):],
+                               'info_dict': {'id': match.group(1) if match else None}})
+
+        final_opts['logger'] = _ItemErrorLogger(on_error, final_opts.get('logger'))
+
+        # Tulis lewat folder staging + rename atomik, fsync per batch
+        writer = OutputWriter()
+        final_opts = writer.apply(final_opts)
 
         with yt_dlp.YoutubeDL(final_opts) as ydl:
             try:
-                ydl.download([url])
-                return True, "Download selesai."
+                retcode = ydl.download([url])
             except Exception as e:
                 return False, str(e)
+            finally:
+                writer.close()
+
+        if self._cancel_event.is_set():
+            return False, "Download dibatalkan"
+        if errors:
+            # ignoreerrors: item lain tetap didownload, tapi hasilnya bukan sukses
+            first = errors[0][len('ERROR: '):]
+            if len(errors) == 1:
+                return False, first
+            return False, f"{len(errors)} item gagal didownload (pertama: {first})"
+        if retcode:
+            return False, f"Download gagal (kode {retcode})"
+        return True, "Download selesai."
+
+    def download_entries(self, entries, options, progress_hook=None, on_result=None):
+        """Download entries playlist (`EntryRef`) sebagai job terpisah per video.
+
+        Dengan supervisor, job di-submit bersamaan (hingga SCHEDULE_WINDOW)
+        dan menunggu slot di scheduler, jadi policy `--schedule` yang
+        menentukan urutannya. Tanpa supervisor, entries didownload berurutan.
+
+        `on_result(entry, success, message)` dipanggil setiap job selesai,
+        bisa dari thread lain. Return list (entry, success, message) dalam
+        urutan entries.
+        """
+        def run(entry):
+            if self._cancel_event.is_set():
+                success, msg = False, "Download dibatalkan"
+            else:
+                success, msg = self.download(entry.url or entry.id, options, progress_hook,
+                                             job_info=entry.job_info())
+            if on_result:
+                on_result(entry, success, msg)
+            return entry, success, msg
+
+        entries = list(entries)
+        if self.priority is not None:
+            for entry in entries:
+                entry.priority = self.priority(entry.title)
+        if self.supervisor is None or len(entries) < 2:
+            return [run(entry) for entry in entries]
+        with ThreadPoolExecutor(max_workers=min(len(entries), SCHEDULE_WINDOW)) as pool:
+            return list(pool.map(run, entries))
+
+    def capture(self, url, options, progress_hook=None):
+        """Capture live stream / HLS ke segmen bergulir (lihat capture.py).
+
+        Opsi: output_dir, format, segment_time, retention, max_duration.
+        Selalu berjalan in-process (tidak lewat supervisor); `cancel()`
+        menghentikan capture dengan rapi dan segmen yang sudah ada tetap utuh.
+        """
+        try:
+            stream_url, headers, info = self._resolve_live(url, options.get('format'))
+        except Exception as e:
+            return False, str(e)
+
+        title = info.get('title') or info.get('id') or 'live'
+        safe_title = "".join(x for x in title if x.isalnum() or x in " -_").strip() or 'live'
+        folder = os.path.join(
+            options.get('output_dir', 'downloads'),
+            f"{safe_title} [{info.get('id') or 'live'}]",
+            time.strftime('live-%Y%m%d-%H%M%S'),
+        )
+        capture = LiveCapture(
+            stream_url, folder,
+            segment_time=options.get('segment_time') or DEFAULT_SEGMENT_TIME,
+            retention=options.get('retention'),
+            max_duration=options.get('max_duration'),
+            headers=headers,
+            progress_hook=progress_hook,
+            cancel_event=self._cancel_event,
+            info_dict={'id': info.get('id'), 'title': title},
+        )
+        try:
+            result = capture.run()
+        except Exception as e:
+            return False, f"{e} (segmen yang sudah ditulis tetap ada di {folder})"
+
+        summary = (f"{result['segments']} segmen, {result['seconds'] / 60:.1f} menit "
+                   f"di {result['folder']}")
+        if result['gaps']:
+            summary += f" ({result['gaps']} segmen terlewat)"
+        if result['reason'] == 'cancelled':
+            return False, f"Capture dihentikan: {summary}"
+        return True, f"Capture selesai: {summary}"
+
+    def _resolve_live(self, url, format_spec=None):
+        """Return (url playlist HLS, header HTTP, info) untuk URL live / .m3u8."""
+        if urlsplit(url).path.endswith('.m3u8'):
+            name = os.path.splitext(os.path.basename(urlsplit(url).path))[0]
+            return url, {}, {'id': name, 'title': name}
+
+        opts = {
+            **self.ydl_opts,
+            'skip_download': True,
+            'format': format_spec or live_format(),
+        }
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+        if not (info.get('protocol') or '').startswith('m3u8') or not info.get('url'):
+            raise Exception("Stream ini tidak tersedia sebagai HLS; mode capture hanya mendukung HLS")
+        return info['url'], info.get('http_headers') or {}, info
@@ -0,0 +1,127 @@
+"""
+Output NDJSON untuk pipeline / orkestrasi.
+
+Satu objek JSON ringkas per baris untuk setiap perubahan state, tanpa
+rendering rich sama sekali:
+
+    metadata       info video/playlist sudah didapat
+    selection      hasil filter playlist (--items, --latest, dll.)
+    progress       snapshot progress (dibatasi per interval)
+    item_finished  satu item selesai: path, ukuran, durasi
+    assets         hasil tahap subtitle/aset tambahan
+    sync           hasil mode sync
+    error          pesan error (dengan id jika untuk satu item yang gagal)
+    done           akhir run (success false jika ada item yang gagal, elapsed)
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+
+DEFAULT_PROGRESS_INTERVAL = 1.0
+
+
+class NdjsonEmitter:
+    """Tulis event sebagai NDJSON ke stream (default: stdout)."""
+
+    def __init__(self, stream=None, progress_interval=DEFAULT_PROGRESS_INTERVAL):
+        self.stream = stream or sys.stdout
+        self.progress_interval = progress_interval
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._last_progress = 0.0
+        self._item_started = {}
+        # Id item yang sudah dilaporkan gagal lewat event error
+        self.failed_ids = set()
+
+    def emit(self, event, **fields):
+        record = {'event': event, 'ts': round(time.time(), 3), **fields}
+        line = json.dumps(record, separators=(',', ':'), ensure_ascii=False, default=str)
+        with self._lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+
+    def metadata(self, summary):
+        presets = None
+        if summary.ladder:
+            # Estimasi ukuran per preset untuk budgeting waktu & disk
+            presets = [
+                {'preset': key, 'bytes': summary.ladder.estimate_bytes(key)}
+                for key in summary.ladder.available_presets()
+            ]
+        self.emit(
+            'metadata',
+            id=summary.id,
+            title=summary.title,
+            uploader=summary.uploader,
+            is_playlist=summary.is_playlist,
+            count=summary.count,
+            duration=summary.duration,
+            presets=presets,
+        )
+
+    def progress_hook(self, d):
+        """Progress hook yt-dlp / YouTubeHandler yang menghasilkan event."""
+        info_dict = d.get('info_dict') or {}
+        video_id = info_dict.get('id')
+        status = d.get('status')
+        now = time.time()
+
+        if status == 'downloading':
+            self._item_started.setdefault(video_id, now)
+            if now - self._last_progress < self.progress_interval:
+                return
+            self._last_progress = now
+            live = {}
+            if d.get('is_live'):
+                # Live capture: tidak ada total_bytes, progress berbasis durasi & bitrate
+                live = {
+                    'captured_seconds': round(d.get('captured_seconds') or 0, 3),
+                    'bitrate': d.get('bitrate'),
+                    'segment_index': d.get('segment_index'),
+                }
+            self.emit(
+                'progress',
+                id=video_id,
+                title=info_dict.get('title'),
+                playlist_index=info_dict.get('playlist_index'),
+                playlist_count=info_dict.get('playlist_count'),
+                downloaded_bytes=d.get('downloaded_bytes'),
+                total_bytes=d.get('total_bytes') or d.get('total_bytes_estimate'),
+                speed=d.get('speed'),
+                eta=d.get('eta'),
+                **live,
+            )
+        elif status == 'item_error':
+            self.item_failed(video_id, d.get('message'), title=info_dict.get('title'))
+        elif status == 'item_finished':
+            path = d.get('filename')
+            started = self._item_started.pop(video_id, None)
+            self.emit(
+                'item_finished',
+                id=video_id,
+                title=info_dict.get('title'),
+                playlist_index=info_dict.get('playlist_index'),
+                path=path,
+                size=os.path.getsize(path) if path and os.path.exists(path) else None,
+                started=round(started, 3) if started else None,
+                seconds=round(now - started, 3) if started else None,
+            )
+
+    def item_failed(self, video_id, message, title=None):
+        """Event `error` untuk satu item; sekali saja per id."""
+        with self._lock:
+            if video_id is not None and video_id in self.failed_ids:
+                return
+            self.failed_ids.add(video_id)
+        self._item_started.pop(video_id, None)
+        self.error(message, id=video_id, title=title)
+
+    def error(self, message, **fields):
+        self.emit('error', message=message, **fields)
+
+    def done(self, success, message=None):
+        self.emit('done', success=success, message=message,
+                  elapsed=round(time.time() - self.started_at, 3))
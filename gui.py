@@ -4,27 +4,52 @@ YouTube Downloader - Desktop GUI (PyQt6)
 """
 
 import os
+import re
 import sys
+import time
+import threading
+import multiprocessing
+from collections import OrderedDict
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QRadioButton, QButtonGroup,
-    QComboBox, QProgressBar, QFileDialog, QMessageBox, QFrame,
+    QComboBox, QProgressBar, QFileDialog, QMessageBox, QFrame, QCheckBox,
     QGroupBox, QSizePolicy, QScrollArea
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QFont, QIcon
+from PyQt6.QtCore import Qt, QThread, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QFont, QIcon, QKeySequence, QShortcut
 
 from downloader import YouTubeHandler
+from supervisor import DownloadSupervisor
+from profiling import Profiler
+from selection import Selection
+from capture import live_format
+from ladder import PRESET_HEIGHTS
+
+# Worker yang tidak melaporkan progress selama ini dianggap macet dan di-kill
+STALL_TIMEOUT = 30 * 60
+
+# Hasil fetch di cache selama ini; tombol Fetch selalu mengambil ulang
+FETCH_CACHE_TTL = 5 * 60
+
+# URL YouTube yang pasti lengkap saat diketik: id video selalu 11 karakter.
+# URL lain (playlist, channel, situs lain) hanya di-fetch otomatis saat di-paste.
+COMPLETE_URL_RE = re.compile(
+    r'^https?://(?:www\.|m\.|music\.)?'
+    r'(?:youtube\.com/(?:watch\?(?:[^#]*&)?v=|shorts/|live/)|youtu\.be/)'
+    r'[\w-]{11}(?:[?&#][^\s]*)?$'
+)
 
 # Quality options
+# (label, format selector, key preset di ladder.VIDEO_PRESETS)
 VIDEO_QUALITIES = [
-    ("🌟 Best Available", "bestvideo+bestaudio/best"),
-    ("📺 4K (2160p)", "bestvideo[height<=2160]+bestaudio/best[height<=2160]"),
-    ("🖥️ 2K (1440p)", "bestvideo[height<=1440]+bestaudio/best[height<=1440]"),
-    ("📀 Full HD (1080p)", "bestvideo[height<=1080]+bestaudio/best[height<=1080]"),
-    ("💿 HD (720p)", "bestvideo[height<=720]+bestaudio/best[height<=720]"),
-    ("📼 SD (480p)", "bestvideo[height<=480]+bestaudio/best[height<=480]"),
-    ("📱 Low (360p)", "bestvideo[height<=360]+bestaudio/best[height<=360]"),
+    ("🌟 Best Available", "bestvideo+bestaudio/best", "best"),
+    ("📺 4K (2160p)", "bestvideo[height<=2160]+bestaudio/best[height<=2160]", "4k"),
+    ("🖥️ 2K (1440p)", "bestvideo[height<=1440]+bestaudio/best[height<=1440]", "1440p"),
+    ("📀 Full HD (1080p)", "bestvideo[height<=1080]+bestaudio/best[height<=1080]", "1080p"),
+    ("💿 HD (720p)", "bestvideo[height<=720]+bestaudio/best[height<=720]", "720p"),
+    ("📼 SD (480p)", "bestvideo[height<=480]+bestaudio/best[height<=480]", "480p"),
+    ("📱 Low (360p)", "bestvideo[height<=360]+bestaudio/best[height<=360]", "360p"),
 ]
 
 AUDIO_QUALITIES = [
@@ -35,18 +60,173 @@ AUDIO_QUALITIES = [
 ]
 
 
-class FetchThread(QThread):
-    """Thread untuk mengambil metadata tanpa blocking UI."""
-    finished = pyqtSignal(dict, str)  # info, error
+class FetchSignals(QObject):
+    finished = pyqtSignal(object, object, str)  # FetchTask, InfoSummary, error
+
+
+class FetchTask(QRunnable):
+    """Satu request metadata yang dijalankan di QThreadPool."""
     
-    def __init__(self, url):
+    def __init__(self, request_id, url, probe_playlist, handler, explicit=False):
         super().__init__()
+        self.setAutoDelete(False)
+        self.request_id = request_id
         self.url = url
-        self.handler = YouTubeHandler()
+        self.probe_playlist = probe_playlist
+        self.handler = handler
+        # True jika dipicu user (tombol Fetch / Enter), bukan auto-fetch
+        self.explicit = explicit
+        self.signals = FetchSignals()
+        self._cancel_event = threading.Event()
     
     def run(self):
-        info, error = self.handler.get_video_info(self.url)
-        self.finished.emit(info or {}, error or "")
+        if self.cancelled:
+            self.signals.finished.emit(self, None, "Dibatalkan")
+            return
+        summary, error = self.handler.get_info_summary(
+            self.url, probe_playlist=self.probe_playlist, cancel_event=self._cancel_event)
+        self.signals.finished.emit(self, summary, error or "")
+    
+    def cancel(self):
+        """Hentikan paging / probe di entry berikutnya."""
+        self._cancel_event.set()
+    
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+    
+    @property
+    def key(self):
+        return (self.url, self.probe_playlist)
+
+
+class FetchCoordinator(QObject):
+    """Koordinator fetch metadata: debounce, batalkan request lama, cache LRU.
+    
+    Hanya hasil request terakhir yang diteruskan ke UI. Request yang
+    tergantikan dibatalkan (paging playlist berhenti di entry berikutnya) dan
+    tidak menahan slot pool untuk request baru. Cache berlaku `cache_ttl`
+    detik; `refresh=True` (tombol Fetch) selalu mengambil ulang.
+    """
+    started = pyqtSignal(str)  # url
+    finished = pyqtSignal(object, str, bool)  # InfoSummary, error, explicit
+    
+    def __init__(self, handler, parent=None, debounce_ms=300, cache_size=16,
+                 cache_ttl=FETCH_CACHE_TTL, max_threads=2):
+        super().__init__(parent)
+        self.handler = handler
+        self.debounce_ms = debounce_ms
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.max_threads = max_threads
+        self.cache = OrderedDict()  # key -> (waktu fetch, InfoSummary)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._dispatch)
+        self._request_id = 0
+        self._pending = None
+        self._tasks = {}  # key -> FetchTask aktif
+        # Task yang dibatalkan tapi masih berjalan; referensi disimpan sampai selesai
+        self._orphans = set()
+    
+    def request(self, url, probe_playlist=False, immediate=False, explicit=False):
+        """Minta metadata `url`. `explicit` (tombol Fetch / Enter) melewati cache."""
+        self._request_id += 1
+        key = (url, probe_playlist)
+        
+        cached = None if explicit else self._cache_get(key)
+        if cached is not None:
+            self._cancel_tasks()
+            self.timer.stop()
+            self._pending = None
+            self.finished.emit(cached, "", explicit)
+            return
+        
+        running = self._tasks.get(key)
+        if running is not None and not running.cancelled:
+            # URL yang sama sedang di-fetch: pakai hasilnya, jangan ekstrak ulang
+            self._cancel_tasks(keep=key)
+            self.timer.stop()
+            self._pending = None
+            running.request_id = self._request_id
+            running.explicit = running.explicit or explicit
+            return
+        
+        self._cancel_tasks()
+        self._pending = (self._request_id, url, probe_playlist, explicit)
+        self.timer.start(0 if immediate else self.debounce_ms)
+    
+    def _dispatch(self):
+        if self._pending is None:
+            return
+        request_id, url, probe_playlist, explicit = self._pending
+        self._pending = None
+        
+        task = FetchTask(request_id, url, probe_playlist, self.handler, explicit)
+        task.signals.finished.connect(self._on_task_finished)
+        self._tasks[(url, probe_playlist)] = task
+        self.pool.start(task)
+        self.started.emit(url)
+    
+    def _cancel_tasks(self, keep=None):
+        for key, task in list(self._tasks.items()):
+            if key == keep:
+                continue
+            task.cancel()
+            del self._tasks[key]
+            # Belum sempat jalan: keluarkan dari antrean, tidak akan emit finished
+            if not self.pool.tryTake(task):
+                self._orphans.add(task)
+        self._resize_pool()
+    
+    def _resize_pool(self):
+        # Request ekstraksi yang sedang berjalan tidak bisa diputus; beri slot
+        # tambahan selama task yang dibatalkan belum selesai
+        self.pool.setMaxThreadCount(self.max_threads + len(self._orphans))
+    
+    def _on_task_finished(self, task, summary, error):
+        if self._tasks.get(task.key) is task:
+            del self._tasks[task.key]
+        if task in self._orphans:
+            self._orphans.discard(task)
+            self._resize_pool()
+        if summary is not None and not task.cancelled:
+            self._cache_put(task.key, summary)
+        if task.cancelled or task.request_id != self._request_id:
+            # Sudah digantikan request yang lebih baru
+            return
+        self.finished.emit(summary, error, task.explicit)
+    
+    def _cache_get(self, key):
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        fetched_at, summary = entry
+        if time.monotonic() - fetched_at > self.cache_ttl:
+            # Kedaluwarsa: tidak di-close karena mungkin masih dipakai UI / download
+            del self.cache[key]
+            return None
+        self.cache.move_to_end(key)
+        return summary
+    
+    def _cache_put(self, key, summary):
+        self.cache[key] = (time.monotonic(), summary)
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            # Sama seperti entry kedaluwarsa: tidak di-close, mungkin masih dipakai UI / download
+            self.cache.popitem(last=False)
+    
+    def clear(self):
+        self._request_id += 1
+        self.timer.stop()
+        self._pending = None
+        self._cancel_tasks()
+        self.pool.waitForDone(3000)
+        for _, summary in self.cache.values():
+            summary.close()
+        self.cache.clear()
 
 
 class DownloadThread(QThread):
@@ -54,19 +234,45 @@ class DownloadThread(QThread):
     progress = pyqtSignal(int, str)  # percentage, status
     finished = pyqtSignal(bool, str)  # success, message
     
-    def __init__(self, url, options):
+    def __init__(self, url, options, supervisor=None, summary=None, selection=None):
         super().__init__()
         self.url = url
         self.options = options
-        self.handler = YouTubeHandler()
+        self.handler = YouTubeHandler(supervisor=supervisor)
+        # Filter playlist dievaluasi di thread ini (bisa memicu paging entries)
+        self.summary = summary
+        self.selection = selection
         self._is_cancelled = False
     
     def run(self):
+        selected = None
+        if self.selection is not None:
+            self.progress.emit(0, "Memfilter video playlist...")
+            try:
+                selected = self.selection.apply(self.summary.iter_entries())
+            except Exception as e:
+                self.finished.emit(False, str(e))
+                return
+            if not selected:
+                self.finished.emit(False, "Tidak ada video yang cocok dengan filter.")
+                return
+            self.progress.emit(0, f"Dipilih {len(selected)} video")
+        
         def progress_hook(d):
-            if self._is_cancelled:
+            # Capture live berhenti sendiri lewat cancel event handler
+            if self._is_cancelled and not d.get('is_live'):
                 raise Exception("Download dibatalkan")
             
-            if d['status'] == 'downloading':
+            if d['status'] == 'downloading' and d.get('is_live'):
+                captured = d.get('captured_seconds') or 0
+                max_duration = d.get('max_duration')
+                percentage = int(captured / max_duration * 100) if max_duration else 0
+                m, s = divmod(int(captured), 60)
+                h, m = divmod(m, 60)
+                bitrate = d.get('bitrate')
+                bitrate_str = f" | {bitrate / 1000:.0f} kbps" if bitrate else ""
+                self.progress.emit(min(percentage, 100), f"🔴 LIVE {h}:{m:02d}:{s:02d}{bitrate_str}")
+            elif d['status'] == 'downloading':
                 try:
                     total = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
                     downloaded = d.get('downloaded_bytes', 0)
@@ -96,23 +302,56 @@ class DownloadThread(QThread):
             elif d['status'] == 'finished':
                 self.progress.emit(100, "Processing...")
         
-        success, msg = self.handler.download(self.url, self.options, progress_hook)
+        if self.summary is not None and self.summary.is_live:
+            success, msg = self.handler.capture(self.url, self.options, progress_hook)
+        elif selected is not None or (self.summary is not None and self.summary.is_playlist
+                                      and self.handler.supervisor is not None):
+            # Job per video (URL entry, bukan posisi) agar hasil filter tetap
+            # tepat walau playlist bergeser, dan worker supervisor dipakai paralel
+            jobs = selected if selected is not None else list(self.summary.iter_entries())
+            results = self.handler.download_entries(jobs, self.options, progress_hook)
+            failed = [entry.title or entry.id for entry, ok, _ in results if not ok]
+            if failed:
+                success, msg = False, f"{len(failed)} dari {len(results)} video gagal: {', '.join(failed[:5])}"
+            else:
+                success, msg = True, f"{len(results)} video selesai didownload."
+        else:
+            success, msg = self.handler.download(self.url, self.options, progress_hook)
         self.finished.emit(success, msg)
     
     def cancel(self):
         self._is_cancelled = True
+        # Worker subprocess di-kill oleh supervisor, tanpa terminate() thread
+        self.handler.cancel()
+    
+    @property
+    def cancelled(self):
+        return self._is_cancelled
 
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.handler = YouTubeHandler()
+        # Download dijalankan di worker subprocess agar hang/leak tidak membekukan GUI.
+        # job_timeout adalah watchdog tanpa progress, bukan batas total durasi download.
+        self.supervisor = DownloadSupervisor(max_workers=2, job_timeout=STALL_TIMEOUT)
         self.video_info = None
         self.download_thread = None
-        self.fetch_thread = None
+        self.profiler = None
+        # Fetch metadata memakai handler bersama di QThreadPool
+        self.fetch_coordinator = FetchCoordinator(self.handler, self)
+        self.fetch_coordinator.started.connect(self.on_fetch_started)
+        self.fetch_coordinator.finished.connect(self.on_fetch_finished)
+        # Koneksi ke YouTube dibuka di background, fetch pertama tidak menunggu handshake
+        self.handler.warm_up()
         
         self.init_ui()
         self.apply_styles()
+        
+        # Debug: Ctrl+Shift+P untuk mulai/berhenti profiling
+        self.profile_shortcut = QShortcut(QKeySequence("Ctrl+Shift+P"), self)
+        self.profile_shortcut.activated.connect(self.toggle_profiling)
     
     def init_ui(self):
         self.setWindowTitle("🎬 YouTube Downloader")
@@ -150,6 +389,9 @@ class MainWindow(QMainWindow):
         self.url_input = QLineEdit()
         self.url_input.setPlaceholderText("Paste URL video atau playlist YouTube...")
         self.url_input.returnPressed.connect(self.fetch_info)
+        # textEdited: hanya perubahan dari user, bukan setText() program
+        self.url_input.textEdited.connect(self.on_url_changed)
+        self._last_url_text = ""
         url_layout.addWidget(self.url_input)
         
         self.fetch_btn = QPushButton("🔍 Fetch")
@@ -214,6 +456,42 @@ class MainWindow(QMainWindow):
         quality_layout.addWidget(self.quality_combo)
         options_layout.addLayout(quality_layout)
         
+        self.probe_check = QCheckBox("📊 Cek kualitas & estimasi ukuran setiap video playlist (lebih lama)")
+        options_layout.addWidget(self.probe_check)
+        
+        # Pilih sebagian video playlist (dievaluasi sebelum ekstraksi per video)
+        self.selection_group = QGroupBox("Pilih Video Playlist")
+        selection_layout = QVBoxLayout(self.selection_group)
+        
+        self.items_input = QLineEdit()
+        self.items_input.setPlaceholderText("Range index, contoh 1-10,15,-5: (kosong = semua)")
+        self.latest_input = QLineEdit()
+        self.latest_input.setPlaceholderText("N terbaru")
+        self.title_filter_input = QLineEdit()
+        self.title_filter_input.setPlaceholderText("Regex judul (kosong = semua)")
+        self.min_duration_input = QLineEdit()
+        self.min_duration_input.setPlaceholderText("Durasi min (5m)")
+        self.max_duration_input = QLineEdit()
+        self.max_duration_input.setPlaceholderText("Durasi max (1:00:00)")
+        self.date_after_input = QLineEdit()
+        self.date_after_input.setPlaceholderText("Setelah (YYYYMMDD)")
+        
+        for label_text, widgets in (
+            ("Item:", (self.items_input, self.latest_input)),
+            ("Judul:", (self.title_filter_input,)),
+            ("Filter:", (self.min_duration_input, self.max_duration_input, self.date_after_input)),
+        ):
+            row = QHBoxLayout()
+            label = QLabel(label_text)
+            label.setFixedWidth(60)
+            row.addWidget(label)
+            for widget in widgets:
+                row.addWidget(widget)
+            selection_layout.addLayout(row)
+        
+        self.selection_group.setVisible(False)
+        options_layout.addWidget(self.selection_group)
+        
         # Output folder
         output_layout = QHBoxLayout()
         output_label = QLabel("Output:")
@@ -360,7 +638,14 @@ class MainWindow(QMainWindow):
     def update_quality_options(self):
         self.quality_combo.clear()
         if self.video_radio.isChecked():
-            for name, value in VIDEO_QUALITIES:
+            ladder = self.video_info.ladder if self.video_info else None
+            has_ladder = bool(ladder and ladder.available_presets())
+            for name, value, key in VIDEO_QUALITIES:
+                # Hanya tampilkan preset yang benar-benar tersedia
+                if has_ladder:
+                    if not ladder.supports(key):
+                        continue
+                    name = f"{name} — {ladder.describe(key)}"
                 self.quality_combo.addItem(name, value)
         else:
             for name, value in AUDIO_QUALITIES:
@@ -377,37 +662,45 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "Masukkan URL YouTube!")
             return
         
-        self.fetch_btn.setEnabled(False)
+        self.fetch_coordinator.request(url, self.probe_check.isChecked(), immediate=True, explicit=True)
+    
+    def on_url_changed(self, text):
+        # Auto-fetch hanya untuk URL yang di-paste (banyak karakter sekaligus)
+        # atau URL video yang sudah lengkap, bukan setiap ketikan
+        pasted = len(text) - len(self._last_url_text) > 1
+        self._last_url_text = text
+        url = text.strip()
+        if (pasted and url.startswith(('http://', 'https://'))) or COMPLETE_URL_RE.match(url):
+            self.fetch_coordinator.request(url, self.probe_check.isChecked())
+    
+    def on_fetch_started(self, url):
         self.fetch_btn.setText("...")
         self.status_label.setText("Mengambil informasi video...")
         self.download_btn.setEnabled(False)
-        
-        self.fetch_thread = FetchThread(url)
-        self.fetch_thread.finished.connect(self.on_fetch_finished)
-        self.fetch_thread.start()
     
-    def on_fetch_finished(self, info, error):
-        self.fetch_btn.setEnabled(True)
+    def on_fetch_finished(self, summary, error, explicit):
         self.fetch_btn.setText("🔍 Fetch")
         
         if error:
             self.status_label.setText(f"Error: {error[:50]}...")
-            QMessageBox.critical(self, "Error", f"Gagal mengambil info:\n{error}")
+            # Auto-fetch yang gagal cukup di status bar; dialog hanya untuk Fetch dari user
+            if explicit:
+                QMessageBox.critical(self, "Error", f"Gagal mengambil info:\n{error}")
             return
         
-        self.video_info = info
-        is_playlist = info.get('_type') == 'playlist'
+        # Summary dimiliki cache FetchCoordinator, jadi tidak di-close di sini
+        self.video_info = summary
         
-        if is_playlist:
-            self.title_label.setText(f"📋 {info.get('title', 'Playlist')}")
-            self.channel_label.setText(f"Uploader: {info.get('uploader', 'N/A')}")
-            count = info.get('playlist_count') or len(info.get('entries', []))
+        if summary.is_playlist:
+            self.title_label.setText(f"📋 {summary.title or 'Playlist'}")
+            self.channel_label.setText(f"Uploader: {summary.uploader or 'N/A'}")
+            count = summary.count if summary.count is not None else "?"
             self.details_label.setText(f"Jumlah Video: {count}")
         else:
-            self.title_label.setText(f"🎬 {info.get('title', 'N/A')}")
-            self.channel_label.setText(f"Channel: {info.get('uploader', 'N/A')}")
+            self.title_label.setText(f"🎬 {summary.title or 'N/A'}")
+            self.channel_label.setText(f"Channel: {summary.uploader or 'N/A'}")
             
-            duration = info.get('duration', 0)
+            duration = summary.duration or 0
             if duration:
                 m, s = divmod(duration, 60)
                 h, m = divmod(m, 60)
@@ -415,7 +708,7 @@ class MainWindow(QMainWindow):
             else:
                 dur_str = "-"
             
-            views = info.get('view_count', 0)
+            views = summary.view_count or 0
             if views >= 1_000_000:
                 views_str = f"{views/1_000_000:.1f}M"
             elif views >= 1_000:
@@ -423,10 +716,17 @@ class MainWindow(QMainWindow):
             else:
                 views_str = str(views)
             
+            if summary.is_live:
+                dur_str = "🔴 Live"
             self.details_label.setText(f"Durasi: {dur_str} | Views: {views_str}")
         
+        self.update_quality_options()
+        self.selection_group.setVisible(summary.is_playlist)
         self.info_group.setVisible(True)
-        self.download_btn.setEnabled(True)
+        # Jangan aktifkan tombol download jika masih ada download berjalan
+        downloading = (self.download_thread is not None and self.download_thread.isRunning()
+                       and not self.download_thread.cancelled)
+        self.download_btn.setEnabled(not downloading)
         self.status_label.setText("Siap untuk download!")
         
         # Auto resize window jika perlu
@@ -446,16 +746,38 @@ class MainWindow(QMainWindow):
         
         # Prepare options
         options = {}
-        
-        is_playlist = self.video_info.get('_type') == 'playlist'
-        if is_playlist:
-            playlist_title = self.video_info.get('title', 'Playlist')
+        selection = None
+        
+        if self.video_info.is_playlist:
+            try:
+                selection = Selection(
+                    items=self.items_input.text().strip() or None,
+                    latest=self.latest_input.text().strip() or None,
+                    match_title=self.title_filter_input.text().strip() or None,
+                    min_duration=self.min_duration_input.text().strip() or None,
+                    max_duration=self.max_duration_input.text().strip() or None,
+                    date_after=self.date_after_input.text().strip() or None,
+                )
+            except ValueError as e:
+                QMessageBox.warning(self, "Filter Playlist", str(e))
+                return
+            if not selection.active:
+                selection = None
+
+            playlist_title = self.video_info.title or 'Playlist'
             safe_title = "".join(x for x in playlist_title if x.isalnum() or x in " -_").strip()
             options['outtmpl'] = os.path.join(output_dir, safe_title, '%(title)s [%(id)s]', '%(title)s [%(id)s].%(ext)s')
         else:
             options['outtmpl'] = os.path.join(output_dir, '%(title)s [%(id)s]', '%(title)s [%(id)s].%(ext)s')
         
-        if is_video:
+        if self.video_info.is_live:
+            if not is_video:
+                QMessageBox.warning(self, "Live", "Capture live hanya untuk tipe video.")
+                return
+            # Capture live: segmen bergulir di folder output, bukan outtmpl yt-dlp
+            key = next(key for _, value, key in VIDEO_QUALITIES if value == quality_value)
+            options = {'output_dir': output_dir, 'format': live_format(PRESET_HEIGHTS[key])}
+        elif is_video:
             options['format'] = quality_value
             options['merge_output_format'] = 'mp4'
         else:
@@ -474,7 +796,10 @@ class MainWindow(QMainWindow):
         self.status_label.setText("Memulai download...")
         
         # Start download thread
-        self.download_thread = DownloadThread(url, options)
+        self.download_thread = DownloadThread(url, options, self.supervisor,
+                                              summary=self.video_info, selection=selection)
+        if self.profiler:
+            self.profiler.instrument(self.download_thread.handler)
         self.download_thread.progress.connect(self.on_progress)
         self.download_thread.finished.connect(self.on_download_finished)
         self.download_thread.start()
@@ -484,6 +809,10 @@ class MainWindow(QMainWindow):
         self.status_label.setText(status)
     
     def on_download_finished(self, success, message):
+        if self.sender() is not self.download_thread or self.download_thread.cancelled:
+            # Hasil dari download yang sudah dibatalkan; UI sudah di-reset
+            return
+        
         self.download_btn.setEnabled(True)
         self.fetch_btn.setEnabled(True)
         self.cancel_btn.setVisible(False)
@@ -499,19 +828,53 @@ class MainWindow(QMainWindow):
     def cancel_download(self):
         if self.download_thread and self.download_thread.isRunning():
             self.download_thread.cancel()
-            self.download_thread.terminate()
             self.download_btn.setEnabled(True)
             self.fetch_btn.setEnabled(True)
             self.cancel_btn.setVisible(False)
             self.status_label.setText("Download dibatalkan")
             self.progress_bar.setValue(0)
+    
+    def toggle_profiling(self):
+        if self.profiler is None:
+            self.profiler = Profiler()
+            self.profiler.instrument(self.handler)
+            self.profiler.start()
+            self.status_label.setText("🩺 Profiling aktif (Ctrl+Shift+P untuk berhenti)")
+            return
+        
+        self.profiler.stop()
+        Profiler.uninstrument(self.handler)
+        prefix = os.path.join('profiles', time.strftime('profile-%Y%m%d-%H%M%S'))
+        collapsed_path, summary_path = self.profiler.write(prefix)
+        summary = self.profiler.format_summary()
+        self.profiler = None
+        self.status_label.setText("Profiling selesai")
+        QMessageBox.information(
+            self, "Profiling",
+            f"{summary}\n\nCollapsed stack: {collapsed_path}\nRingkasan: {summary_path}"
+        )
+    
+    def closeEvent(self, event):
+        if self.download_thread and self.download_thread.isRunning():
+            self.download_thread.cancel()
+            self.download_thread.wait(3000)
+        self.fetch_coordinator.clear()
+        self.supervisor.shutdown()
+        if self.profiler:
+            self.profiler.stop()
+            self.profiler.write(os.path.join('profiles', time.strftime('profile-%Y%m%d-%H%M%S')))
+        super().closeEvent(event)
 
 
 def main():
+    # Diperlukan agar worker subprocess jalan di build PyInstaller
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     
     window = MainWindow()
+    if '--profile' in sys.argv:
+        window.toggle_profiling()
     window.show()
     
     sys.exit(app.exec())
@@ -0,0 +1,182 @@
+"""
+Format ladder: resolusi yang benar-benar tersedia + estimasi ukuran.
+
+Dibangun dari list `formats` hasil extract yt-dlp, sehingga UI hanya
+menawarkan preset kualitas yang memang ada dan bisa menampilkan estimasi
+ukuran/bitrate sebelum download dimulai.
+"""
+
+# (key, max_height); None = kualitas terbaik yang tersedia
+VIDEO_PRESETS = [
+    ('best', None),
+    ('4k', 2160),
+    ('1440p', 1440),
+    ('1080p', 1080),
+    ('720p', 720),
+    ('480p', 480),
+    ('360p', 360),
+]
+
+PRESET_HEIGHTS = dict(VIDEO_PRESETS)
+
+
+def preset_format(max_height):
+    """Format selector yt-dlp untuk tinggi maksimum tertentu."""
+    if max_height is None:
+        return 'bestvideo+bestaudio/best'
+    return f'bestvideo[height<={max_height}]+bestaudio/best[height<={max_height}]'
+
+
+def format_bytes(size):
+    if not size:
+        return "?"
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def _estimate_size(fmt, duration, bitrate):
+    size = fmt.get('filesize') or fmt.get('filesize_approx')
+    if size:
+        return int(size)
+    if bitrate and duration:
+        # tbr/abr dalam kbit/s
+        return int(bitrate * 1000 / 8 * duration)
+    return None
+
+
+class LadderRung:
+    """Satu anak tangga: format video terbaik untuk satu tinggi."""
+    __slots__ = ('height', 'format_id', 'vcodec', 'has_audio', 'tbr', 'est_bytes')
+
+    def __init__(self, height, format_id, vcodec, has_audio, tbr, est_bytes):
+        self.height = height
+        self.format_id = format_id
+        self.vcodec = vcodec
+        self.has_audio = has_audio
+        self.tbr = tbr
+        self.est_bytes = est_bytes
+
+
+class FormatLadder:
+    """Ladder format satu video, diindeks berdasarkan tinggi."""
+    __slots__ = ('rungs', 'audio_bytes', 'audio_abr')
+
+    def __init__(self, rungs, audio_bytes=None, audio_abr=None):
+        # Urut dari tinggi terbesar
+        self.rungs = sorted(rungs, key=lambda r: r.height, reverse=True)
+        self.audio_bytes = audio_bytes
+        self.audio_abr = audio_abr
+
+    @classmethod
+    def from_info(cls, info):
+        duration = info.get('duration')
+        best_by_height = {}
+        best_audio = None
+        for fmt in info.get('formats') or []:
+            vcodec = fmt.get('vcodec') or 'none'
+            acodec = fmt.get('acodec') or 'none'
+            height = fmt.get('height')
+            if vcodec == 'none':
+                if acodec != 'none':
+                    abr = fmt.get('abr') or fmt.get('tbr') or 0
+                    if best_audio is None or abr > best_audio[0]:
+                        best_audio = (abr, _estimate_size(fmt, duration, abr))
+                continue
+            if not height:
+                continue
+            tbr = fmt.get('tbr') or fmt.get('vbr') or 0
+            current = best_by_height.get(height)
+            if current is None or tbr > current.tbr:
+                best_by_height[height] = LadderRung(
+                    height, fmt.get('format_id'), vcodec.split('.')[0],
+                    acodec != 'none', tbr, _estimate_size(fmt, duration, tbr),
+                )
+        audio_abr, audio_bytes = best_audio if best_audio else (None, None)
+        return cls(best_by_height.values(), audio_bytes, audio_abr)
+
+    @property
+    def max_height(self):
+        return self.rungs[0].height if self.rungs else None
+
+    def rung_for(self, max_height):
+        """Rung yang akan dipilih selector `bestvideo[height<=max_height]`."""
+        for rung in self.rungs:
+            if max_height is None or rung.height <= max_height:
+                return rung
+        return None
+
+    def supports(self, key):
+        """True jika preset memberikan resolusi yang memang sesuai labelnya.
+
+        Preset 4K pada video 1080p tidak "ada": selector-nya akan jatuh ke
+        1080p, jadi tidak ditawarkan.
+        """
+        if not self.rungs:
+            return False
+        max_height = PRESET_HEIGHTS[key]
+        if max_height is None:
+            return True
+        rung = self.rung_for(max_height)
+        if rung is None:
+            return False
+        lower = [h for _, h in VIDEO_PRESETS if h is not None and h < max_height]
+        floor = max(lower) if lower else 0
+        return rung.height > floor
+
+    def estimate_bytes(self, key):
+        """Estimasi ukuran download (video + audio) untuk preset."""
+        rung = self.rung_for(PRESET_HEIGHTS[key])
+        if rung is None or rung.est_bytes is None:
+            return None
+        if rung.has_audio:
+            return rung.est_bytes
+        return rung.est_bytes + (self.audio_bytes or 0)
+
+    def available_presets(self):
+        return [key for key, _ in VIDEO_PRESETS if self.supports(key)]
+
+    def describe(self, key):
+        """Teks singkat untuk UI, misal '1080p avc1 ~2.5 Mbps, ~120.0 MB'."""
+        rung = self.rung_for(PRESET_HEIGHTS[key])
+        if rung is None:
+            return ""
+        parts = [f"{rung.height}p {rung.vcodec}"]
+        if rung.tbr:
+            parts[0] += f" ~{rung.tbr / 1000:.1f} Mbps"
+        size = self.estimate_bytes(key)
+        if size:
+            parts.append(f"~{format_bytes(size)}")
+        return ", ".join(parts)
+
+
+class PlaylistLadder:
+    """Gabungan ladder semua entry playlist, dengan total ukuran per preset."""
+    __slots__ = ('ladders', 'failed')
+
+    def __init__(self, ladders, failed=0):
+        self.ladders = ladders
+        self.failed = failed
+
+    def supports(self, key):
+        return any(ladder.supports(key) for ladder in self.ladders)
+
+    def supported_count(self, key):
+        return sum(1 for ladder in self.ladders if ladder.supports(key))
+
+    def estimate_bytes(self, key):
+        sizes = [ladder.estimate_bytes(key) for ladder in self.ladders]
+        known = [s for s in sizes if s]
+        return sum(known) if known else None
+
+    def available_presets(self):
+        return [key for key, _ in VIDEO_PRESETS if self.supports(key)]
+
+    def describe(self, key):
+        size = self.estimate_bytes(key)
+        text = f"{self.supported_count(key)}/{len(self.ladders)} video"
+        if size:
+            text += f", total ~{format_bytes(size)}"
+        return text
@@ -1,13 +1,28 @@
 import os
 import sys
+import time
+import atexit
 import argparse
+import multiprocessing
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, DownloadColumn, TransferSpeedColumn, TimeRemainingColumn
+from rich.markup import escape
+from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, DownloadColumn, TransferSpeedColumn, TimeRemainingColumn, TimeElapsedColumn
 from rich.table import Table
 import questionary
 from downloader import YouTubeHandler
+from sync import sync_playlist
+from ladder import format_bytes, PRESET_HEIGHTS
+from supervisor import DownloadSupervisor
+from scheduler import POLICIES, TitlePriority
+from profiling import Profiler
+from assets import download_assets
+from events import NdjsonEmitter
+from selection import Selection
+from capture import live_format
+from yt_dlp.utils import parse_duration
+import transport
 
 console = Console()
 handler = YouTubeHandler()
@@ -25,6 +40,12 @@ VIDEO_QUALITY_MAP = {
     '360p': 'bestvideo[height<=360]+bestaudio/best[height<=360]',
 }
 
+# Alias CLI -> key preset di ladder.VIDEO_PRESETS
+PRESET_ALIASES = {
+    '2160p': '4k',
+    '2k': '1440p',
+}
+
 AUDIO_QUALITY_MAP = {
     'mp3': 'mp3',
     'm4a': 'm4a',
@@ -32,6 +53,11 @@ AUDIO_QUALITY_MAP = {
     'wav': 'wav',
 }
 
+# Worker subprocess default dengan --isolate. Download terikat jaringan,
+# bukan CPU, dan setiap worker memuat yt-dlp sendiri, jadi tidak ikut
+# jumlah CPU.
+DEFAULT_WORKERS = 3
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
@@ -43,6 +69,10 @@ Contoh penggunaan:
   %(prog)s "URL" -t video -q 1080p            # Download video 1080p
   %(prog)s "URL" -t audio -q mp3              # Download audio MP3
   %(prog)s "URL" -t video -q best -o ./media  # Download ke folder custom
+  %(prog)s "URL_CHANNEL" --sync               # Download hanya video baru
+  %(prog)s "URL_PLAYLIST" --items 1-10        # Hanya video 1 s/d 10
+  %(prog)s "URL_CHANNEL" --latest 5 --max-duration 10m
+  %(prog)s "URL_LIVE" --live-segment 10m --live-max 2h   # Capture live stream
         '''
     )
     
@@ -55,8 +85,75 @@ Contoh penggunaan:
                         help='Direktori output (default: downloads)')
     parser.add_argument('-i', '--interactive', action='store_true',
                         help='Force mode interactive')
+    parser.add_argument('--sync', action='store_true',
+                        help='Sync inkremental playlist/channel: hanya download video baru')
+    parser.add_argument('--probe', action='store_true',
+                        help='Playlist: cek kualitas tersedia & estimasi ukuran setiap video (paralel)')
+    parser.add_argument('--isolate', action='store_true',
+                        help='Jalankan download di worker subprocess terpisah')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, metavar='N',
+                        help=f'Jumlah worker subprocess paralel (dengan --isolate, default: {DEFAULT_WORKERS})')
+    parser.add_argument('--job-timeout', type=int, metavar='DETIK',
+                        help='Kill job yang tidak ada progress selama DETIK (dengan --isolate)')
+    parser.add_argument('--job-memory', type=int, metavar='MB',
+                        help='Batas memori worker per job dalam MB (dengan --isolate, POSIX)')
+    parser.add_argument('--jobs-per-worker', type=int, default=20, metavar='N',
+                        help='Recycle worker setelah N job (default: 20)')
+    parser.add_argument('--schedule', choices=list(POLICIES), default='fifo',
+                        help='Policy antrean job (dengan --isolate): fifo, sjf, priority, fair')
+    parser.add_argument('--priority', action='append', metavar='REGEX',
+                        help='Dengan --schedule priority: video yang judulnya cocok didownload lebih dulu; '
+                             'bisa diulang, regex pertama paling prioritas')
+    parser.add_argument('--items', metavar='SPEC',
+                        help='Playlist: pilih index, contoh 1-10,15,-5: (format --playlist-items yt-dlp)')
+    parser.add_argument('--latest', type=int, metavar='N',
+                        help='Playlist: hanya N video terbaru (setelah filter lain)')
+    parser.add_argument('--date-after', metavar='YYYYMMDD',
+                        help='Playlist: hanya video yang diupload pada/setelah tanggal ini')
+    parser.add_argument('--date-before', metavar='YYYYMMDD',
+                        help='Playlist: hanya video yang diupload pada/sebelum tanggal ini')
+    parser.add_argument('--min-duration', metavar='DURASI',
+                        help='Playlist: durasi minimum (contoh: 90, 5m, 1:30:00)')
+    parser.add_argument('--max-duration', metavar='DURASI',
+                        help='Playlist: durasi maksimum (contoh: 600, 10m)')
+    parser.add_argument('--match-title', metavar='REGEX',
+                        help='Playlist: hanya video yang judulnya cocok dengan regex (tanpa beda huruf besar/kecil)')
+    parser.add_argument('--reject-title', metavar='REGEX',
+                        help='Playlist: lewati video yang judulnya cocok dengan regex')
+    parser.add_argument('--live', action='store_true',
+                        help='Mode capture live/HLS (otomatis jika video sedang live); URL .m3u8 juga bisa')
+    parser.add_argument('--live-segment', default='5m', metavar='DURASI',
+                        help='Capture: durasi per file segmen (default: 5m)')
+    parser.add_argument('--live-retention', metavar='DURASI',
+                        help='Capture: hanya simpan segmen dalam window ini (contoh: 2h), sisanya dihapus')
+    parser.add_argument('--live-max', metavar='DURASI',
+                        help='Capture: berhenti setelah durasi ini')
+    parser.add_argument('--subs', metavar='LANGS',
+                        help='Download subtitle untuk bahasa ini, pisahkan dengan koma (contoh: en,id atau all)')
+    parser.add_argument('--auto-subs', action='store_true',
+                        help='Sertakan subtitle auto-generated jika subtitle manual tidak ada')
+    parser.add_argument('--chapters', action='store_true',
+                        help='Simpan chapters ke <judul>.chapters.json')
+    parser.add_argument('--description', action='store_true',
+                        help='Simpan deskripsi video ke <judul>.description')
+    parser.add_argument('--output-format', choices=['text', 'ndjson'], default='text',
+                        help='text (default) atau ndjson: satu event JSON per baris ke stdout, tanpa rich')
+    parser.add_argument('--profile', nargs='?', const='', metavar='PREFIX',
+                        help='Profiling per tahap; tulis PREFIX.collapsed & PREFIX.txt saat keluar')
+    parser.add_argument('--net-stats', action='store_true',
+                        help='Tampilkan statistik koneksi (reuse, handshake TLS, DNS) saat keluar')
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers minimal 1")
+    if args.priority:
+        if args.schedule != 'priority':
+            parser.error("--priority hanya berlaku dengan --schedule priority")
+        try:
+            args.priority = TitlePriority(args.priority)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
 
 
 def run_non_interactive(args):
@@ -66,64 +163,98 @@ def run_non_interactive(args):
     quality = args.quality or ('best' if download_type == 'video' else 'mp3')
     output_dir = args.output
     
+    if args.output_format == 'ndjson':
+        run_ndjson(args, download_type, quality)
+    
     # Validasi quality
-    if download_type == 'video':
-        if quality.lower() not in VIDEO_QUALITY_MAP:
-            console.print(f"[bold red]Error:[/bold red] Kualitas video tidak valid: {quality}")
-            console.print(f"Pilihan: {', '.join(VIDEO_QUALITY_MAP.keys())}")
-            sys.exit(1)
-        format_str = VIDEO_QUALITY_MAP[quality.lower()]
-    else:
-        if quality.lower() not in AUDIO_QUALITY_MAP:
-            console.print(f"[bold red]Error:[/bold red] Format audio tidak valid: {quality}")
-            console.print(f"Pilihan: {', '.join(AUDIO_QUALITY_MAP.keys())}")
+    value, choices = resolve_quality(download_type, quality)
+    if value is None:
+        label = "Kualitas video" if download_type == 'video' else "Format audio"
+        console.print(f"[bold red]Error:[/bold red] {label} tidak valid: {quality}")
+        console.print(f"Pilihan: {', '.join(choices)}")
+        sys.exit(1)
+    
+    try:
+        selection = Selection.from_args(args)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        sys.exit(1)
+    
+    if args.sync:
+        if selection.active:
+            console.print("[bold red]Error:[/bold red] Filter playlist tidak bisa dipakai bersama --sync")
             sys.exit(1)
-        audio_format = AUDIO_QUALITY_MAP[quality.lower()]
+        run_sync(url, output_dir, build_format_options(download_type, value), args)
+    
+    if args.live:
+        console.print(f"[bold cyan]🔗 URL:[/bold cyan] {url}")
+        run_capture(url, output_dir, download_type, quality, args)
     
     # Ambil metadata
     console.print(f"[bold cyan]🔗 URL:[/bold cyan] {url}")
     with console.status("[bold green]Mengambil metadata...[/bold green]", spinner="dots"):
-        info, error = handler.get_video_info(url)
+        # Range terbatas (misal --items 1-50) tidak perlu menghitung seluruh playlist
+        summary, error = handler.get_info_summary(url, resolve_count=selection.limit is None)
     
     if error:
         console.print(f"[bold red]Gagal mengambil info:[/bold red] {error}")
         sys.exit(1)
     
+    if summary.is_live:
+        console.print("[bold red]🔴 Video sedang live:[/bold red] beralih ke mode capture")
+        run_capture(url, output_dir, download_type, quality, args)
+    
+    # Siapkan opsi download
+    dl_options = {}
+    # Download per video: hasil filter, atau seluruh playlist dengan --isolate
+    # agar --schedule berlaku
+    jobs = None
+    
     # Tampilkan info singkat
-    is_playlist = info.get('_type') == 'playlist'
+    is_playlist = summary.is_playlist
     if is_playlist:
-        console.print(f"[bold cyan]📋 Playlist:[/bold cyan] {info.get('title', 'N/A')}")
-        count = info.get('playlist_count') or len(info.get('entries', []))
+        console.print(f"[bold cyan]📋 Playlist:[/bold cyan] {summary.title or 'N/A'}")
+        count = summary.count if summary.count is not None else "Unknown"
         console.print(f"[bold cyan]📊 Jumlah Video:[/bold cyan] {count}")
+        entries = summary.iter_entries()
+        if selection.active:
+            with console.status("[bold green]Memfilter video playlist...[/bold green]", spinner="dots"):
+                entries = selection.apply(entries)
+            console.print(f"[bold cyan]🔎 Dipilih:[/bold cyan] {len(entries)} video ({selection.describe()})")
+            if selection.unknown:
+                console.print(f"[dim]{selection.unknown} video tanpa durasi/tanggal di metadata tetap disertakan[/dim]")
+            if not entries:
+                console.print("[bold yellow]Tidak ada video yang cocok dengan filter.[/bold yellow]")
+                sys.exit(1)
+            # Download berdasarkan URL entry terpilih, bukan posisi: playlist
+            # bisa bergeser antara enumerasi dan download
+            jobs = entries
+        if args.probe and download_type == 'video':
+            # Hanya video terpilih yang dicek
+            with console.status("[bold green]Mengecek format setiap video...[/bold green]", spinner="dots"):
+                summary.ladder = handler.probe_ladders(entries)
+        if jobs is None and handler.supervisor is not None:
+            jobs = list(summary.iter_entries())
     else:
-        console.print(f"[bold cyan]🎬 Judul:[/bold cyan] {info.get('title', 'N/A')}")
-        console.print(f"[bold cyan]📺 Channel:[/bold cyan] {info.get('uploader', 'N/A')}")
+        console.print(f"[bold cyan]🎬 Judul:[/bold cyan] {summary.title or 'N/A'}")
+        console.print(f"[bold cyan]📺 Channel:[/bold cyan] {summary.uploader or 'N/A'}")
     
     console.print(f"[bold cyan]📁 Output:[/bold cyan] {output_dir}/")
     console.print(f"[bold cyan]🎯 Tipe:[/bold cyan] {download_type.capitalize()}")
     console.print(f"[bold cyan]⚡ Kualitas:[/bold cyan] {quality}")
     console.print()
     
-    # Siapkan opsi download
-    dl_options = {}
+    if download_type == 'video' and summary.ladder:
+        print_ladder(summary.ladder)
+        preset = PRESET_ALIASES.get(quality.lower(), quality.lower())
+        if not summary.ladder.supports(preset):
+            available = ', '.join(summary.ladder.available_presets())
+            console.print(f"[bold yellow]⚠️  Kualitas {quality} tidak tersedia, yt-dlp akan memilih yang terdekat.[/bold yellow]")
+            console.print(f"[dim]Tersedia: {available}[/dim]\n")
     
-    if is_playlist:
-        playlist_title = info.get('title', 'Playlist')
-        safe_title = "".join(x for x in playlist_title if x.isalnum() or x in " -_").strip()
-        dl_options['outtmpl'] = os.path.join(output_dir, safe_title, '%(title)s [%(id)s]', '%(title)s [%(id)s].%(ext)s')
-    else:
-        dl_options['outtmpl'] = os.path.join(output_dir, '%(title)s [%(id)s]', '%(title)s [%(id)s].%(ext)s')
+    dl_options['outtmpl'] = build_outtmpl(output_dir, summary)
     
-    if download_type == 'video':
-        dl_options['format'] = format_str
-        dl_options['merge_output_format'] = 'mp4'
-    else:
-        dl_options['format'] = 'bestaudio/best'
-        dl_options['postprocessors'] = [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': audio_format,
-            'preferredquality': '192',
-        }]
+    dl_options.update(build_format_options(download_type, value))
     
     # Download dengan progress bar
     progress = Progress(
@@ -167,17 +298,392 @@ def run_non_interactive(args):
         elif d['status'] == 'finished':
             progress.update(task_id, description="[bold green]Processing...[/bold green]")
     
+    def on_failed(entry, msg):
+        progress.console.print(f"[bold red]❌ {escape(entry.title or entry.id)}:[/bold red] {escape(msg)}")
+    
+    finished = []
+    progress_hook = track_finished(progress_hook, finished)
+    
     console.print("[bold green]⬇️  Mulai download...[/bold green]")
     with progress:
-        success, msg = handler.download(url, dl_options, progress_hook)
+        if jobs is not None:
+            success, msg = download_jobs(jobs, dl_options, progress_hook, on_failed)
+        else:
+            success, msg = handler.download(url, dl_options, progress_hook)
     
     if success:
         console.print(f"\n[bold green]✅ {msg}[/bold green]")
+        run_asset_stage(args, finished)
         console.print(f"[dim]File tersimpan di folder '{output_dir}'[/dim]")
         sys.exit(0)
     else:
         console.print(f"\n[bold red]❌ Error:[/bold red] {msg}")
+        # Playlist yang sebagian gagal: aset tetap diambil untuk video yang berhasil
+        run_asset_stage(args, finished)
+        sys.exit(1)
+
+def build_format_options(download_type, value):
+    """Opsi format yt-dlp untuk tipe video (format string) atau audio (codec)."""
+    if download_type == 'video':
+        return {
+            'format': value,
+            'merge_output_format': 'mp4',
+        }
+    return {
+        'format': 'bestaudio/best',
+        'postprocessors': [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': value,
+            'preferredquality': '192',
+        }],
+    }
+
+
+def resolve_quality(download_type, quality):
+    """Return (format string / codec, pilihan valid); nilai None jika tidak valid."""
+    quality_map = VIDEO_QUALITY_MAP if download_type == 'video' else AUDIO_QUALITY_MAP
+    return quality_map.get(quality.lower()), list(quality_map)
+
+
+def build_outtmpl(output_dir, summary):
+    """outtmpl yt-dlp: playlist mendapat sub-folder sendiri."""
+    if summary.is_playlist:
+        playlist_title = summary.title or 'Playlist'
+        safe_title = "".join(x for x in playlist_title if x.isalnum() or x in " -_").strip()
+        output_dir = os.path.join(output_dir, safe_title)
+    return os.path.join(output_dir, '%(title)s [%(id)s]', '%(title)s [%(id)s].%(ext)s')
+
+
+def download_jobs(entries, dl_options, progress_hook, on_failed=None):
+    """Download entries playlist sebagai job per video (lihat download_entries).
+
+    Return (success, message) seperti handler.download; `on_failed(entry,
+    message)` dipanggil untuk setiap video yang gagal.
+    """
+    def on_result(entry, success, msg):
+        if not success and on_failed:
+            on_failed(entry, msg)
+
+    results = handler.download_entries(entries, dl_options, progress_hook, on_result=on_result)
+    failed = sum(1 for _, success, _ in results if not success)
+    if failed:
+        return False, f"{failed} dari {len(results)} video gagal didownload."
+    return True, f"{len(results)} video selesai didownload."
+
+
+def asset_options(args):
+    """Filter tahap aset dari argumen CLI; None jika tidak ada aset yang diminta."""
+    languages = [lang.strip() for lang in (args.subs or '').split(',') if lang.strip()]
+    if not (languages or args.chapters or args.description):
+        return None
+    return {
+        'languages': languages,
+        'include_auto': args.auto_subs,
+        'chapters': args.chapters,
+        'description': args.description,
+    }
+
+
+def track_finished(progress_hook, finished):
+    """Bungkus progress hook: catat path final setiap item (untuk tahap aset)."""
+    def hook(d):
+        if d.get('status') == 'item_finished' and d.get('filename'):
+            finished.append(d['filename'])
+        progress_hook(d)
+    return hook
+
+
+def run_asset_stage(args, media_paths):
+    """Fetch subtitle/chapters/deskripsi untuk video yang baru didownload."""
+    options = asset_options(args)
+    if options is None or not media_paths:
+        return
+    
+    with console.status("[bold green]Mengambil subtitle & aset tambahan...[/bold green]", spinner="dots"):
+        result = download_assets(media_paths, **options)
+    console.print(
+        f"[bold cyan]📎 Aset:[/bold cyan] {result['written']} file dari {result['videos']} video "
+        f"({result['elapsed']:.1f} s)"
+    )
+    for path, error in result['failed']:
+        console.print(f"[bold red]❌ {os.path.basename(path)}:[/bold red] {error}")
+
+
+def run_ndjson(args, download_type, quality):
+    """Mode --output-format ndjson: event JSON per baris ke stdout, tanpa rich."""
+    emitter = NdjsonEmitter()
+    
+    value, choices = resolve_quality(download_type, quality)
+    if value is None:
+        emitter.error(f"Kualitas tidak valid: {quality}", choices=choices)
+        emitter.done(False)
+        sys.exit(1)
+    try:
+        selection = Selection.from_args(args)
+    except ValueError as e:
+        emitter.error(str(e))
+        emitter.done(False)
         sys.exit(1)
+    dl_options = build_format_options(download_type, value)
+    options = asset_options(args)
+    finished = []
+    progress_hook = track_finished(emitter.progress_hook, finished)
+    
+    if args.sync:
+        if selection.active:
+            emitter.error("Filter playlist tidak bisa dipakai bersama --sync")
+            emitter.done(False)
+            sys.exit(1)
+        result, error = sync_playlist(handler, args.url, args.output, dl_options, progress_hook)
+        if error:
+            emitter.error(error)
+            emitter.done(False)
+            sys.exit(1)
+        emitter.emit(
+            'sync', playlist_id=result['playlist_id'], title=result['title'], new=result['new'],
+            retried=result['retried'], walked=result['walked'], downloaded=result['downloaded'],
+            failed=[{'id': video_id, 'message': msg} for video_id, msg in result['failed']],
+        )
+        if options and finished:
+            emitter.emit('assets', **download_assets(finished, **options))
+        emitter.done(not result['failed'])
+        sys.exit(1 if result['failed'] else 0)
+    
+    summary, error = (None, None) if args.live else handler.get_info_summary(
+        args.url, resolve_count=selection.limit is None)
+    if error:
+        emitter.error(error)
+        emitter.done(False)
+        sys.exit(1)
+    if args.live or summary.is_live:
+        try:
+            capture_options = build_capture_options(args.output, download_type, quality, args)
+        except ValueError as e:
+            emitter.error(str(e))
+            emitter.done(False)
+            sys.exit(1)
+        if summary is not None:
+            emitter.metadata(summary)
+        success, msg = handler.capture(args.url, capture_options, emitter.progress_hook)
+        if not success:
+            emitter.error(msg)
+        emitter.done(success, msg)
+        sys.exit(0 if success else 1)
+    jobs = None
+    if summary.is_playlist:
+        entries = summary.iter_entries()
+        if selection.active:
+            entries = selection.apply(entries)
+            emitter.emit('selection', selected=len(entries), total=summary.count,
+                         unknown=selection.unknown, filters=selection.describe())
+            if not entries:
+                emitter.error("Tidak ada video yang cocok dengan filter.")
+                emitter.done(False)
+                sys.exit(1)
+            jobs = entries
+        if args.probe and download_type == 'video':
+            summary.ladder = handler.probe_ladders(entries)
+        if jobs is None and handler.supervisor is not None:
+            jobs = list(summary.iter_entries())
+    emitter.metadata(summary)
+    
+    dl_options['outtmpl'] = build_outtmpl(args.output, summary)
+    if jobs is not None:
+        success, msg = download_jobs(
+            jobs, dl_options, progress_hook,
+            on_failed=lambda entry, msg: emitter.item_failed(entry.id, msg, title=entry.title),
+        )
+    else:
+        success, msg = handler.download(args.url, dl_options, progress_hook)
+    
+    # Playlist yang sebagian gagal: aset tetap diambil untuk video yang berhasil
+    if options and finished:
+        emitter.emit('assets', **download_assets(finished, **options))
+    if not success and not emitter.failed_ids:
+        # Error per item sudah dilaporkan lewat event error masing-masing
+        emitter.error(msg)
+    emitter.done(success, msg)
+    sys.exit(0 if success else 1)
+
+
+def parse_duration_arg(value, flag):
+    """Durasi CLI (detik, '10m', '1:30:00') ke detik; ValueError jika tidak valid."""
+    if value is None:
+        return None
+    seconds = parse_duration(value)
+    if not seconds:
+        raise ValueError(f"Durasi tidak valid untuk {flag}: {value}")
+    return seconds
+
+
+def build_capture_options(output_dir, download_type, quality, args):
+    """Opsi YouTubeHandler.capture dari argumen CLI."""
+    if download_type != 'video':
+        raise ValueError("Mode capture live hanya untuk tipe video")
+    preset = PRESET_ALIASES.get(quality.lower(), quality.lower())
+    if preset not in PRESET_HEIGHTS:
+        raise ValueError(f"Kualitas video tidak valid: {quality}")
+    return {
+        'output_dir': output_dir,
+        'format': live_format(PRESET_HEIGHTS[preset]),
+        'segment_time': parse_duration_arg(args.live_segment, '--live-segment'),
+        'retention': parse_duration_arg(args.live_retention, '--live-retention'),
+        'max_duration': parse_duration_arg(args.live_max, '--live-max'),
+    }
+
+
+def run_capture(url, output_dir, download_type, quality, args):
+    """Capture live stream ke segmen bergulir dengan progress berbasis bitrate."""
+    try:
+        options = build_capture_options(output_dir, download_type, quality, args)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        sys.exit(1)
+    
+    console.print(f"[bold cyan]📁 Output:[/bold cyan] {output_dir}/")
+    console.print(f"[bold cyan]🔴 Mode:[/bold cyan] Capture live (segmen {format_seconds(options['segment_time'])})")
+    if options['retention']:
+        console.print(f"[bold cyan]🗂️  Retention:[/bold cyan] {format_seconds(options['retention'])} terakhir")
+    if options['max_duration']:
+        console.print(f"[bold cyan]⏱️  Maksimum:[/bold cyan] {format_seconds(options['max_duration'])}")
+    console.print("[dim]Tekan Ctrl+C untuk berhenti; segmen yang sudah ditulis tetap utuh.[/dim]\n")
+    
+    success, msg = capture_with_progress(url, options)
+    if success:
+        console.print(f"\n[bold green]✅ {escape(msg)}[/bold green]")
+        sys.exit(0)
+    console.print(f"\n[bold red]❌ {escape(msg)}[/bold red]")
+    sys.exit(1)
+
+
+def capture_with_progress(url, options):
+    """Jalankan handler.capture dengan progress rich. Return (success, pesan)."""
+    progress = Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        TimeElapsedColumn(),
+        console=console
+    )
+    task_id = progress.add_task("Menunggu segmen...", total=None)
+    
+    def progress_hook(d):
+        if d['status'] == 'downloading':
+            bitrate = d.get('bitrate')
+            desc = f"[red]🔴 LIVE[/red] [cyan]{format_seconds(d.get('captured_seconds'))}[/cyan]"
+            if bitrate:
+                desc += f" | {bitrate / 1000:.0f} kbps | segmen {d.get('segment_index')}"
+            total = None
+            if d.get('max_duration') and bitrate:
+                # Tanpa total_bytes: estimasi dari bitrate x durasi maksimum
+                total = bitrate / 8 * d['max_duration']
+            progress.update(task_id, total=total, completed=d.get('downloaded_bytes', 0), description=desc)
+        elif d['status'] == 'item_finished':
+            progress.console.print(f"[dim]✔ {os.path.basename(d['filename'])}[/dim]")
+    
+    try:
+        with progress:
+            return handler.capture(url, options, progress_hook)
+    except KeyboardInterrupt:
+        # Dihentikan user: segmen terakhir sudah ditutup oleh LiveCapture
+        return True, f"Capture dihentikan. Segmen tersimpan di folder '{options['output_dir']}'."
+
+
+def run_sync(url, output_dir, dl_options, args):
+    """Sync inkremental: enumerasi sampai konten yang dikenal, download delta."""
+    console.print(f"[bold cyan]🔗 URL:[/bold cyan] {url}")
+    console.print(f"[bold cyan]📁 Output:[/bold cyan] {output_dir}/")
+    console.print("[bold cyan]🔄 Mode:[/bold cyan] Sync")
+    console.print()
+
+    progress = Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        TimeRemainingColumn(),
+        console=console
+    )
+    task_id = progress.add_task("Downloading...", total=None)
+    current = {'done': 0, 'total': None}
+
+    def on_item(done, total, entry, success, msg):
+        current['done'], current['total'] = done, total
+        if not success:
+            progress.console.print(f"[bold red]❌ {escape(entry.title or entry.id)}:[/bold red] {escape(msg)}")
+
+    def progress_hook(d):
+        if d['status'] == 'downloading':
+            total = d.get('total_bytes') or d.get('total_bytes_estimate')
+            title = (d.get('info_dict') or {}).get('title') or ''
+            display_title = (title[:30] + '...') if len(title) > 30 else title
+            counter = f"[{current['done']}/{current['total']}] " if current['total'] else ""
+            if total:
+                progress.update(task_id, total=total, completed=d.get('downloaded_bytes', 0),
+                                description=f"[cyan]{escape(counter + display_title)}[/cyan]")
+        elif d['status'] == 'finished':
+            progress.update(task_id, description="[bold green]Processing...[/bold green]")
+
+    finished = []
+    console.print("[bold green]🔄 Mencari video baru...[/bold green]")
+    with progress:
+        result, error = sync_playlist(handler, url, output_dir, dl_options,
+                                      track_finished(progress_hook, finished), on_item=on_item)
+
+    if error:
+        console.print(f"\n[bold red]❌ Error:[/bold red] {error}")
+        sys.exit(1)
+
+    console.print(f"\n[bold cyan]📋 Playlist:[/bold cyan] {result['title']}")
+    console.print(f"[bold cyan]🆕 Video baru:[/bold cyan] {result['new']} (diperiksa: {result['walked']})")
+    if result['retried']:
+        console.print(f"[bold cyan]🔁 Dicoba lagi:[/bold cyan] {result['retried']} (gagal pada sync sebelumnya)")
+    console.print(f"[bold green]✅ Berhasil:[/bold green] {len(result['downloaded'])}")
+    if result['failed']:
+        console.print(f"[bold red]❌ Gagal:[/bold red] {len(result['failed'])} (dicoba lagi pada sync berikutnya)")
+    run_asset_stage(args, finished)
+    sys.exit(1 if result['failed'] else 0)
+
+
+def start_profiling(prefix, stderr=False):
+    """Aktifkan profiler untuk handler global; hasil ditulis saat program keluar."""
+    prefix = prefix or os.path.join('profiles', time.strftime('profile-%Y%m%d-%H%M%S'))
+    profiler = Profiler()
+    profiler.instrument(handler)
+    profiler.start()
+
+    def finish():
+        profiler.stop()
+        collapsed_path, summary_path = profiler.write(prefix)
+        table = Table(title="Profiling per Tahap")
+        for column in ("Tahap", "Panggilan", "Wall (s)", "Sampel", "%"):
+            table.add_column(column, justify="left" if column == "Tahap" else "right")
+        for stage, calls, wall, samples, pct in profiler.summary_rows():
+            table.add_row(stage, str(calls), f"{wall:.3f}", str(samples), f"{pct:.1f}")
+        # Mode ndjson: jangan campur tabel dengan event di stdout
+        out = Console(stderr=True) if stderr else console
+        out.print(table)
+        out.print(f"[dim]Collapsed stack: {collapsed_path}\nRingkasan: {summary_path}[/dim]")
+
+    atexit.register(finish)
+    return profiler
+
+
+def report_transport(stderr=False):
+    """Tampilkan statistik transport bersama (proses utama) saat program keluar."""
+    def finish():
+        # Mode ndjson: jangan campur dengan event di stdout
+        out = Console(stderr=True) if stderr else console
+        out.print(Panel(transport.format_stats(), title="Statistik Koneksi", border_style="cyan", expand=False))
+        if handler.supervisor is not None:
+            out.print("[dim]Download berjalan di worker subprocess; statistik hanya mencakup proses utama.[/dim]")
+
+    atexit.register(finish)
+
 
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
@@ -197,17 +703,73 @@ def format_seconds(seconds):
         return f"{int(h)}:{int(m):02d}:{int(s):02d}"
     return f"{int(m)}:{int(s):02d}"
 
-def get_quality_options(type_choice):
+def print_ladder(ladder):
+    """Tampilkan kualitas yang tersedia beserta estimasi ukuran."""
+    table = Table(title="Kualitas Tersedia", box=None)
+    table.add_column("Preset", style="bold cyan")
+    table.add_column("Detail")
+    table.add_column("Estimasi", justify="right")
+    for key in ladder.available_presets():
+        table.add_row(key, ladder.describe(key), format_bytes(ladder.estimate_bytes(key)))
+    if getattr(ladder, 'failed', 0):
+        table.caption = f"{ladder.failed} video gagal dicek"
+    console.print(table)
+    console.print()
+
+def ask_selection(summary):
+    """Tanya range/filter playlist.
+
+    Return list EntryRef terpilih, None jika tanpa filter (semua video), atau
+    list kosong jika user menyerah karena tidak ada yang cocok.
+    """
+    while True:
+        answers = questionary.form(
+            items=questionary.text("Range index (contoh 1-10,15,-5:, kosong = semua):"),
+            latest=questionary.text("Hanya N video terbaru (kosong = semua):"),
+            match_title=questionary.text("Judul cocok dengan regex (kosong = semua):"),
+            min_duration=questionary.text("Durasi minimum (contoh 5m, kosong = bebas):"),
+            max_duration=questionary.text("Durasi maksimum (contoh 1:00:00, kosong = bebas):"),
+            date_after=questionary.text("Diupload setelah (YYYYMMDD, kosong = bebas):"),
+        ).ask()
+        if not answers:
+            return None
+        answers = {key: value.strip() or None for key, value in answers.items()}
+        try:
+            selection = Selection(**answers)
+        except ValueError as e:
+            console.print(f"[bold red]{e}[/bold red]")
+            continue
+        if not selection.active:
+            return None
+
+        with console.status("[bold green]Memfilter video playlist...[/bold green]", spinner="dots"):
+            selected = selection.apply(summary.iter_entries())
+        console.print(f"[bold cyan]🔎 Dipilih:[/bold cyan] {len(selected)} video ({selection.describe()})")
+        if selection.unknown:
+            console.print(f"[dim]{selection.unknown} video tanpa durasi/tanggal di metadata tetap disertakan[/dim]")
+        if selected:
+            return selected
+        if not questionary.confirm("Tidak ada video yang cocok. Ubah filter?").ask():
+            return []
+
+def get_quality_options(type_choice, ladder=None):
     if type_choice == 'Video':
-        return [
-            {"name": "🌟 Best Available (Max)", "value": "bestvideo+bestaudio/best"},
-            {"name": "📺 4K (2160p)", "value": "bestvideo[height<=2160]+bestaudio/best[height<=2160]"},
-            {"name": "🖥️ 2K (1440p)", "value": "bestvideo[height<=1440]+bestaudio/best[height<=1440]"},
-            {"name": "📀 Full HD (1080p)", "value": "bestvideo[height<=1080]+bestaudio/best[height<=1080]"},
-            {"name": "💿 HD (720p)", "value": "bestvideo[height<=720]+bestaudio/best[height<=720]"},
-            {"name": "📼 SD (480p)", "value": "bestvideo[height<=480]+bestaudio/best[height<=480]"},
-            {"name": "📱 Low (360p)", "value": "bestvideo[height<=360]+bestaudio/best[height<=360]"},
+        options = [
+            {"name": "🌟 Best Available (Max)", "key": "best", "value": "bestvideo+bestaudio/best"},
+            {"name": "📺 4K (2160p)", "key": "4k", "value": "bestvideo[height<=2160]+bestaudio/best[height<=2160]"},
+            {"name": "🖥️ 2K (1440p)", "key": "1440p", "value": "bestvideo[height<=1440]+bestaudio/best[height<=1440]"},
+            {"name": "📀 Full HD (1080p)", "key": "1080p", "value": "bestvideo[height<=1080]+bestaudio/best[height<=1080]"},
+            {"name": "💿 HD (720p)", "key": "720p", "value": "bestvideo[height<=720]+bestaudio/best[height<=720]"},
+            {"name": "📼 SD (480p)", "key": "480p", "value": "bestvideo[height<=480]+bestaudio/best[height<=480]"},
+            {"name": "📱 Low (360p)", "key": "360p", "value": "bestvideo[height<=360]+bestaudio/best[height<=360]"},
         ]
+        if ladder and ladder.available_presets():
+            # Hanya tawarkan preset yang benar-benar ada, plus estimasi ukuran
+            options = [
+                {**opt, "name": f"{opt['name']} — {ladder.describe(opt['key'])}"}
+                for opt in options if ladder.supports(opt['key'])
+            ]
+        return options
     else: # Audio
         return [
             {"name": "🎧 Best Quality (MP3)", "value": "mp3"},
@@ -217,6 +779,8 @@ def get_quality_options(type_choice):
         ]
 
 def main():
+    # Siapkan koneksi ke YouTube selagi user mengetik URL
+    handler.warm_up()
     while True:
         clear_screen()
         print_header()
@@ -231,7 +795,7 @@ def main():
 
         # 2. Get Metadata
         with console.status("[bold green]Sedang mengambil metadata...[/bold green]", spinner="dots"):
-            info, error = handler.get_video_info(url)
+            summary, error = handler.get_info_summary(url)
 
         if error:
             console.print(f"[bold red]Gagal mengambil info: {error}[/bold red]")
@@ -240,7 +804,7 @@ def main():
             continue
 
         # 3. Tampilkan Info
-        is_playlist = info.get('_type') == 'playlist'
+        is_playlist = summary.is_playlist
         
         table = Table(show_header=False, box=None)
         table.add_column("Key", style="bold cyan")
@@ -248,25 +812,29 @@ def main():
         
         if is_playlist:
             table.add_row("Tipe", "Playlist")
-            table.add_row("Judul", info.get('title', 'N/A'))
-            table.add_row("Uploader", info.get('uploader', 'N/A'))
-            count = info.get('playlist_count')
-            if count is None and 'entries' in info:
-                # Try to estimate if possible, or just say 'Unknown'
-                try:
-                    count = len(info['entries'])
-                except:
-                    count = "Unknown"
+            table.add_row("Judul", summary.title or 'N/A')
+            table.add_row("Uploader", summary.uploader or 'N/A')
+            count = summary.count if summary.count is not None else "Unknown"
             table.add_row("Jumlah Video", str(count))
         else:
-            table.add_row("Judul", info.get('title', 'N/A'))
-            table.add_row("Channel", info.get('uploader', 'N/A'))
-            table.add_row("Durasi", format_seconds(info.get('duration')))
-            table.add_row("Views", f"{info.get('view_count', 0):,}")
+            table.add_row("Judul", summary.title or 'N/A')
+            table.add_row("Channel", summary.uploader or 'N/A')
+            table.add_row("Durasi", "🔴 Live" if summary.is_live else format_seconds(summary.duration))
+            table.add_row("Views", f"{summary.view_count or 0:,}")
         
         console.print(Panel(table, title="Video/Playlist Info", border_style="blue", expand=False))
         console.print("\n")
 
+        if summary.is_live:
+            if questionary.confirm("🔴 Video ini sedang live. Capture sekarang? (Ctrl+C untuk berhenti)").ask():
+                options = {'output_dir': 'downloads', 'format': live_format(), 'segment_time': 300}
+                success, msg = capture_with_progress(url, options)
+                style = "green" if success else "yellow"
+                console.print(Panel(f"[bold {style}]{escape(msg)}[/bold {style}]", title="Capture Live", border_style=style))
+            if not questionary.confirm("Download video lain?").ask():
+                break
+            continue
+
         # 4. Pilih Tipe Output
         type_choice = questionary.select(
             "Pilih tipe download:",
@@ -279,8 +847,25 @@ def main():
         # Clean type choice for logic (remove emoji)
         clean_type = "Video" if "Video" in type_choice else "Audio"
 
+        # Opsional: pilih sebagian video playlist sebelum download
+        selected = None
+        if is_playlist and questionary.confirm("Pilih sebagian video saja (range/filter)?", default=False).ask():
+            selected = ask_selection(summary)
+            if selected == []:
+                continue
+
         # 5. Pilih Kualitas
-        quality_opts = get_quality_options(clean_type)
+        ladder = summary.ladder
+        if clean_type == 'Video' and is_playlist and (ladder is None or selected is not None):
+            if questionary.confirm(
+                "Cek kualitas tersedia & estimasi ukuran setiap video? (lebih lama)",
+                default=False
+            ).ask():
+                with console.status("[bold green]Mengecek format setiap video...[/bold green]", spinner="dots"):
+                    ladder = handler.probe_ladders(selected if selected is not None else summary.iter_entries())
+                if selected is None:
+                    summary.ladder = ladder
+        quality_opts = get_quality_options(clean_type, ladder if clean_type == 'Video' else None)
         # Tambahkan opsi kembali
         quality_opts.append({"name": "🔙 Kembali", "value": "back"})
 
@@ -302,7 +887,7 @@ def main():
         
         if is_playlist:
             # Use playlist title for folder
-            playlist_title = info.get('title', 'Playlist')
+            playlist_title = summary.title or 'Playlist'
             # Simple sanitization
             safe_title = "".join(x for x in playlist_title if x.isalnum() or x in " -_").strip()
             dl_options['outtmpl'] = os.path.join('downloads', safe_title, '%(title)s [%(id)s]', '%(title)s [%(id)s].%(ext)s')
@@ -369,7 +954,12 @@ def main():
                 progress.update(task_id, description="[bold green]Processing...[/bold green]")
 
         with progress:
-            success, msg = handler.download(url, dl_options, progress_hook)
+            if is_playlist and (selected is not None or handler.supervisor is not None):
+                # Video terpilih didownload per URL, bukan per posisi di playlist
+                jobs = selected if selected is not None else list(summary.iter_entries())
+                success, msg = download_jobs(jobs, dl_options, progress_hook)
+            else:
+                success, msg = handler.download(url, dl_options, progress_hook)
 
         if success:
             console.print(Panel(f"[bold green]{msg}[/bold green]\nFile tersimpan di folder 'downloads'", title="Sukses", border_style="green"))
@@ -383,9 +973,26 @@ def main():
             break
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     try:
         args = parse_arguments()
         
+        if args.isolate:
+            handler.supervisor = DownloadSupervisor(
+                max_workers=args.workers,
+                max_jobs_per_worker=args.jobs_per_worker,
+                memory_limit_mb=args.job_memory,
+                job_timeout=args.job_timeout,
+                policy=args.schedule,
+            )
+            handler.priority = args.priority
+        
+        if args.profile is not None:
+            start_profiling(args.profile, stderr=args.output_format == 'ndjson')
+        
+        if args.net_stats:
+            report_transport(stderr=args.output_format == 'ndjson')
+        
         # Tentukan mode: interactive atau non-interactive
         if args.url and not args.interactive:
             # Mode non-interactive jika URL diberikan
@@ -0,0 +1,201 @@
+"""
+Profiling ringan per tahap (extract, download, progress hook, render, ffmpeg).
+
+Sampler di background thread mengambil stack semua thread secara berkala
+(`sys._current_frames`), jadi QThread dan thread refresh rich ikut
+terprofil. Setiap sampel diberi label tahap: tahap eksplisit dari
+`Profiler.stage()`, atau ditebak dari lokasi kode (rich -> render,
+postprocessor yt-dlp -> postprocess/ffmpeg).
+
+Output:
+- `<prefix>.collapsed` : format collapsed-stack (flamegraph.pl / speedscope)
+- `<prefix>.txt`       : tabel ringkasan per tahap
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+DEFAULT_INTERVAL = 0.005
+
+# Method YouTubeHandler yang dihitung sebagai tahap 'extract'
+EXTRACT_METHODS = ('get_video_info', 'get_info_summary', 'open_playlist', 'probe_ladders')
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _infer_stage(stack_files):
+    for filename in stack_files:
+        normalized = filename.replace('\\', '/')
+        if '/yt_dlp/postprocessor/' in normalized:
+            return 'postprocess'
+        if '/rich/' in normalized:
+            return 'render'
+    return 'other'
+
+
+class Profiler:
+    """Sampling profiler dengan atribusi per tahap."""
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.samples = Counter()          # collapsed stack -> jumlah sampel
+        self.stage_samples = Counter()    # tahap -> jumlah sampel
+        self.stage_time = defaultdict(float)
+        self.stage_calls = Counter()
+        self._stages = {}                 # thread id -> stack nama tahap
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_at = None
+        self._elapsed = 0.0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='profiler-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._elapsed += time.perf_counter() - self._started_at
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    @contextmanager
+    def stage(self, name):
+        """Tandai blok kode sebagai tahap `name` (boleh bersarang)."""
+        ident = threading.get_ident()
+        with self._lock:
+            stack = self._stages.setdefault(ident, [])
+            # Tahap yang sama bersarang hanya dihitung sekali
+            outermost = name not in stack
+            stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stack.pop()
+                if outermost:
+                    self.stage_time[name] += elapsed
+                    self.stage_calls[name] += 1
+
+    def wrap(self, name, func):
+        def wrapper(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def instrument(self, handler):
+        """Bungkus method YouTubeHandler (instance) dengan tahap profiling."""
+        for method in EXTRACT_METHODS:
+            setattr(handler, method, self.wrap('extract', getattr(handler, method)))
+
+        download = handler.download
+
+        def profiled_download(url, options, progress_hook=None, **kwargs):
+            if progress_hook is not None:
+                progress_hook = self.wrap('progress_hook', progress_hook)
+            with self.stage('download'):
+                return download(url, options, progress_hook, **kwargs)
+
+        handler.download = profiled_download
+
+        capture = handler.capture
+
+        def profiled_capture(url, options, progress_hook=None):
+            if progress_hook is not None:
+                progress_hook = self.wrap('progress_hook', progress_hook)
+            with self.stage('download'):
+                return capture(url, options, progress_hook)
+
+        handler.capture = profiled_capture
+        return handler
+
+    @staticmethod
+    def uninstrument(handler):
+        """Kembalikan method handler ke versi aslinya (method class)."""
+        for method in EXTRACT_METHODS + ('download', 'capture'):
+            handler.__dict__.pop(method, None)
+        return handler
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                stages = {ident: stack[-1] for ident, stack in self._stages.items() if stack}
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                labels = []
+                files = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    files.append(frame.f_code.co_filename)
+                    frame = frame.f_back
+                stage = stages.get(ident)
+                inferred = _infer_stage(files)
+                if stage is None:
+                    stage = inferred
+                elif inferred == 'postprocess':
+                    # Waktu tunggu ffmpeg di dalam download
+                    stage = 'postprocess'
+                labels.reverse()
+                self.samples[f"{stage};" + ";".join(labels)] += 1
+                self.stage_samples[stage] += 1
+
+    def summary_rows(self):
+        """Return list (tahap, panggilan, wall time, sampel, % sampel)."""
+        total = sum(self.stage_samples.values()) or 1
+        stages = set(self.stage_samples) | set(self.stage_time)
+        rows = []
+        for stage in sorted(stages, key=lambda s: -self.stage_samples[s]):
+            rows.append((
+                stage,
+                self.stage_calls.get(stage, 0),
+                self.stage_time.get(stage, 0.0),
+                self.stage_samples[stage],
+                100.0 * self.stage_samples[stage] / total,
+            ))
+        return rows
+
+    def format_summary(self):
+        lines = [
+            f"Durasi profiling: {self._elapsed:.2f} s, interval sampel {self.interval * 1000:.0f} ms",
+            f"{'Tahap':<16}{'Panggilan':>10}{'Wall (s)':>12}{'Sampel':>10}{'%':>8}",
+        ]
+        for stage, calls, wall, samples, pct in self.summary_rows():
+            lines.append(f"{stage:<16}{calls:>10}{wall:>12.3f}{samples:>10}{pct:>7.1f}%")
+        return "\n".join(lines)
+
+    def write(self, prefix):
+        """Tulis file collapsed-stack dan ringkasan. Return (collapsed, summary)."""
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        collapsed_path = prefix + '.collapsed'
+        summary_path = prefix + '.txt'
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(self.format_summary() + "\n")
+        return collapsed_path, summary_path
@@ -0,0 +1,175 @@
+"""
+Penjadwalan job download yang antre menunggu worker.
+
+Policy menentukan job mana yang mendapat slot worker berikutnya:
+
+- fifo     : urut kedatangan (default, perilaku lama)
+- sjf      : shortest-job-first berdasarkan estimasi ukuran / durasi
+- priority : prioritas eksplisit (angka lebih besar duluan), lalu FIFO;
+             sumbernya misalnya `TitlePriority` (regex judul)
+- fair     : giliran adil per uploader, agar satu channel besar tidak
+             memonopoli antrean
+"""
+
+import re
+import itertools
+import threading
+from collections import defaultdict
+
+# Estimasi bitrate (byte/detik) jika hanya durasi yang diketahui, ~2 Mbps
+DEFAULT_BYTES_PER_SECOND = 250_000
+
+
+class Job:
+    """Job yang menunggu / sedang memakai slot worker."""
+    __slots__ = ('seq', 'duration', 'size', 'uploader', 'priority')
+
+    def __init__(self, seq, duration=None, size=None, uploader=None, priority=0):
+        self.seq = seq
+        self.duration = duration
+        self.size = size
+        self.uploader = uploader
+        self.priority = priority
+
+    @classmethod
+    def from_info(cls, seq, info):
+        """Buat Job dari dict mirip info yt-dlp (duration, filesize, uploader, priority)."""
+        info = info or {}
+        return cls(
+            seq,
+            duration=info.get('duration'),
+            size=info.get('filesize') or info.get('filesize_approx'),
+            uploader=info.get('uploader') or info.get('channel'),
+            priority=info.get('priority') or 0,
+        )
+
+    @property
+    def cost(self):
+        """Estimasi biaya job dalam byte; tak hingga jika tidak diketahui."""
+        if self.size:
+            return self.size
+        if self.duration:
+            return self.duration * DEFAULT_BYTES_PER_SECOND
+        return float('inf')
+
+
+class TitlePriority:
+    """Prioritas job dari judul video, untuk policy `priority`.
+
+    Regex dicek berurutan dan yang pertama cocok menentukan prioritas:
+    regex yang disebut lebih awal mendapat prioritas lebih tinggi. Judul
+    yang tidak cocok dengan regex mana pun mendapat 0.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = []
+        for pattern in patterns:
+            try:
+                self.patterns.append(re.compile(pattern, re.IGNORECASE))
+            except re.error as e:
+                raise ValueError(f"Regex prioritas tidak valid: {pattern} ({e})")
+
+    def __call__(self, title):
+        for index, pattern in enumerate(self.patterns):
+            if title and pattern.search(title):
+                return len(self.patterns) - index
+        return 0
+
+
+class FifoPolicy:
+    name = 'fifo'
+
+    def key(self, job):
+        return job.seq
+
+    def on_start(self, job):
+        pass
+
+    def on_finish(self, job):
+        pass
+
+
+class ShortestJobFirstPolicy(FifoPolicy):
+    name = 'sjf'
+
+    def key(self, job):
+        return (job.cost, job.seq)
+
+
+class PriorityPolicy(FifoPolicy):
+    name = 'priority'
+
+    def key(self, job):
+        return (-job.priority, job.seq)
+
+
+class FairSharePolicy(FifoPolicy):
+    """Uploader yang paling sedikit dilayani mendapat giliran berikutnya."""
+    name = 'fair'
+
+    def __init__(self):
+        self.served = defaultdict(int)
+
+    def key(self, job):
+        return (self.served[job.uploader], job.seq)
+
+    def on_start(self, job):
+        self.served[job.uploader] += 1
+
+
+POLICIES = {
+    'fifo': FifoPolicy,
+    'sjf': ShortestJobFirstPolicy,
+    'priority': PriorityPolicy,
+    'fair': FairSharePolicy,
+}
+
+
+def make_policy(policy):
+    """Terima nama policy atau instance policy."""
+    if isinstance(policy, str):
+        if policy not in POLICIES:
+            raise ValueError(f"Policy tidak dikenal: {policy} (pilihan: {', '.join(POLICIES)})")
+        return POLICIES[policy]()
+    return policy
+
+
+class JobScheduler:
+    """Pembagi slot worker: job yang menunggu dilayani sesuai policy.
+
+    Slot yang kosong langsung diberikan ke job pilihan policy dan hanya job
+    itu yang dibangunkan, jadi antrean panjang tidak membangunkan semua
+    thread yang menunggu setiap kali satu job selesai.
+    """
+
+    def __init__(self, slots, policy='fifo'):
+        self.policy = make_policy(policy)
+        self._free = slots
+        self._waiting = {}  # Job -> Condition milik job tersebut
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def acquire(self, info=None):
+        """Blocking sampai policy memberi slot untuk job ini. Return Job."""
+        with self._lock:
+            job = Job.from_info(next(self._seq), info)
+            ready = threading.Condition(self._lock)
+            self._waiting[job] = ready
+            self._dispatch()
+            while job in self._waiting:
+                ready.wait()
+            return job
+
+    def release(self, job):
+        with self._lock:
+            self._free += 1
+            self.policy.on_finish(job)
+            self._dispatch()
+
+    def _dispatch(self):
+        while self._free > 0 and self._waiting:
+            job = min(self._waiting, key=self.policy.key)
+            ready = self._waiting.pop(job)
+            self._free -= 1
+            self.policy.on_start(job)
+            ready.notify()
@@ -0,0 +1,218 @@
+"""
+Seleksi entries playlist sebelum ekstraksi per video.
+
+Filter dievaluasi terhadap entries hasil flat extraction (`EntryRef`), jadi
+video yang tidak dipilih tidak pernah diekstrak atau didownload. Entry
+terpilih didownload lewat URL/ID-nya masing-masing (bukan posisi di
+playlist), jadi hasilnya tetap tepat walau playlist bergeser setelah
+enumerasi.
+
+Filter di-compile sekali (regex, tanggal, spesifikasi range), lalu setiap
+filter dijalankan sebagai satu pass atas satu kolom (durasi, tanggal,
+judul) dan menghasilkan mask, bukan memanggil predikat per entry.
+
+Entry tanpa durasi/tanggal di metadata flat tetap disertakan, karena baru
+bisa dipastikan setelah ekstraksi penuh.
+"""
+
+import re
+import datetime
+from itertools import compress, islice
+
+from yt_dlp.utils import PlaylistEntries, parse_duration
+
+
+def _parse_date(value, label):
+    """Terima YYYYMMDD atau YYYY-MM-DD; return string YYYYMMDD."""
+    if value is None:
+        return None
+    digits = value.replace('-', '')
+    try:
+        datetime.datetime.strptime(digits, '%Y%m%d')
+    except ValueError:
+        raise ValueError(f"{label} tidak valid: {value} (format: YYYYMMDD)")
+    return digits
+
+
+def _parse_seconds(value, label):
+    """Terima detik, '90m', '1:30:00', dll."""
+    if value is None:
+        return None
+    seconds = parse_duration(str(value))
+    if seconds is None:
+        raise ValueError(f"{label} tidak valid: {value} (contoh: 600, 10m, 1:30:00)")
+    return seconds
+
+
+def _compile_regex(pattern, label):
+    if not pattern:
+        return None
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error as e:
+        raise ValueError(f"Regex {label} tidak valid: {e}")
+
+
+class Selection:
+    """Range index, filter tanggal/durasi/judul, dan 'N terbaru'."""
+
+    def __init__(self, items=None, date_after=None, date_before=None, min_duration=None,
+                 max_duration=None, match_title=None, reject_title=None, latest=None):
+        self.items_spec = items or None
+        try:
+            self._items = list(PlaylistEntries.parse_playlist_items(items)) if items else None
+        except ValueError as e:
+            raise ValueError(f"Range item tidak valid: {items} ({e})")
+        self.date_after = _parse_date(date_after, "Tanggal awal")
+        self.date_before = _parse_date(date_before, "Tanggal akhir")
+        self.min_duration = _parse_seconds(min_duration, "Durasi minimum")
+        self.max_duration = _parse_seconds(max_duration, "Durasi maksimum")
+        self.match_title = _compile_regex(match_title, "judul")
+        self.reject_title = _compile_regex(reject_title, "pengecualian judul")
+        if latest is not None and int(latest) <= 0:
+            raise ValueError("Jumlah video terbaru harus lebih dari 0")
+        self.latest = int(latest) if latest is not None else None
+        # Diisi oleh apply(): jumlah entry yang lolos karena metadata tidak lengkap
+        self.unknown = 0
+
+    @classmethod
+    def from_args(cls, args):
+        """Bangun dari argumen CLI (lihat main.py)."""
+        return cls(
+            items=args.items,
+            date_after=args.date_after,
+            date_before=args.date_before,
+            min_duration=args.min_duration,
+            max_duration=args.max_duration,
+            match_title=args.match_title,
+            reject_title=args.reject_title,
+            latest=args.latest,
+        )
+
+    @property
+    def active(self):
+        return any((
+            self._items is not None, self.date_after, self.date_before,
+            self.min_duration is not None, self.max_duration is not None,
+            self.match_title, self.reject_title, self.latest,
+        ))
+
+    @property
+    def limit(self):
+        """Jumlah entry yang cukup di-enumerasi, atau None jika butuh semua.
+
+        Hanya range index positif yang berhingga (misal "1-50") yang bisa
+        berhenti lebih awal; index negatif butuh jumlah total.
+        """
+        if self._items is None or self.latest is not None:
+            return None
+        end = 0
+        for item in self._items:
+            if isinstance(item, int):
+                if item < 0:
+                    return None
+                end = max(end, item)
+                continue
+            step = item.step or 1
+            if step < 0 or item.stop is None or item.stop < 0 or item.stop == float('inf') \
+                    or (item.start is not None and item.start < 0):
+                return None
+            end = max(end, int(item.stop))
+        return end
+
+    def _index_mask(self, count):
+        mask = bytearray(count)
+        for item in self._items:
+            if isinstance(item, int):
+                index = item - 1 if item > 0 else count + item
+                if 0 <= index < count:
+                    mask[index] = 1
+                continue
+            # Semantik sama dengan --playlist-items yt-dlp (1-based, inklusif)
+            step = item.step or 1
+            if item.start is None:
+                start = 0 if step > 0 else count - 1
+            else:
+                start = item.start - 1 if item.start >= 0 else count + item.start
+            if item.stop is None or item.stop == float('inf'):
+                stop = count if step > 0 else -1
+            else:
+                stop = int(item.stop) - 1 if item.stop >= 0 else count + int(item.stop)
+                stop += 1 if step > 0 else -1
+            # Potong ke batas list tanpa mengubah kelipatan step
+            if step > 0:
+                if start < 0:
+                    start += (-start + step - 1) // step * step
+                stop = min(stop, count)
+            else:
+                if start > count - 1:
+                    start += (start - count + 1 - step - 1) // -step * step
+                stop = max(stop, -1)
+            for index in range(start, stop, step):
+                mask[index] = 1
+        return mask
+
+    def apply(self, entries):
+        """Return list EntryRef terpilih (urutan playlist) dari iterable `entries`."""
+        limit = self.limit
+        entries = list(islice(entries, limit) if limit is not None else entries)
+        count = len(entries)
+        mask = self._index_mask(count) if self._items is not None else bytearray(b'\x01') * count
+        unknown = bytearray(count)
+
+        if self.min_duration is not None or self.max_duration is not None:
+            low = self.min_duration if self.min_duration is not None else float('-inf')
+            high = self.max_duration if self.max_duration is not None else float('inf')
+            durations = [entry.duration for entry in entries]
+            unknown = bytearray(u or d is None for u, d in zip(unknown, durations))
+            mask = bytearray(m and (d is None or low <= d <= high) for m, d in zip(mask, durations))
+
+        if self.date_after or self.date_before:
+            low = self.date_after or '00000000'
+            high = self.date_before or '99999999'
+            dates = [entry.date for entry in entries]
+            unknown = bytearray(u or d is None for u, d in zip(unknown, dates))
+            mask = bytearray(m and (d is None or low <= d <= high) for m, d in zip(mask, dates))
+
+        if self.match_title or self.reject_title:
+            match = self.match_title.search if self.match_title else None
+            reject = self.reject_title.search if self.reject_title else None
+            titles = [entry.title or '' for entry in entries]
+            if match:
+                mask = bytearray(m and match(t) is not None for m, t in zip(mask, titles))
+            if reject:
+                mask = bytearray(m and reject(t) is None for m, t in zip(mask, titles))
+
+        selected = list(compress(range(count), mask))
+        if self.latest is not None and len(selected) > self.latest:
+            dates = [entries[i].date for i in selected]
+            if all(dates):
+                # Tanggal lengkap: ambil N terbaru, tetap dalam urutan playlist
+                newest = sorted(range(len(selected)), key=lambda k: dates[k], reverse=True)[:self.latest]
+                selected = [selected[k] for k in sorted(newest)]
+            else:
+                # Tanpa tanggal: urutan channel/tab sudah terbaru di depan
+                selected = selected[:self.latest]
+
+        self.unknown = sum(1 for i in selected if unknown[i])
+        return [entries[i] for i in selected]
+
+    def describe(self):
+        """Ringkasan filter aktif untuk ditampilkan ke user."""
+        parts = []
+        if self.items_spec:
+            parts.append(f"item {self.items_spec}")
+        if self.date_after or self.date_before:
+            parts.append(f"tanggal {self.date_after or '...'} s/d {self.date_before or '...'}")
+        if self.min_duration is not None or self.max_duration is not None:
+            low = f"{self.min_duration:.0f}s" if self.min_duration is not None else '...'
+            high = f"{self.max_duration:.0f}s" if self.max_duration is not None else '...'
+            parts.append(f"durasi {low} s/d {high}")
+        if self.match_title:
+            parts.append(f"judul ~ /{self.match_title.pattern}/")
+        if self.reject_title:
+            parts.append(f"tanpa judul ~ /{self.reject_title.pattern}/")
+        if self.latest:
+            parts.append(f"{self.latest} terbaru")
+        return ', '.join(parts)
+
@@ -0,0 +1,147 @@
+"""
+Ringkasan info video/playlist yang hemat memori.
+
+`get_video_info` mengembalikan dict info lengkap termasuk seluruh `entries`.
+Untuk channel dengan puluhan ribu video, dict itu besar padahal UI hanya
+menampilkan judul dan jumlah video. `InfoSummary` hanya menyimpan field yang
+dipakai UI, dan entries diambil per halaman secara lazy dalam bentuk
+`EntryRef` yang ringkas.
+"""
+
+import datetime
+
+from ladder import FormatLadder
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def _entry_date(entry):
+    """Tanggal upload (YYYYMMDD) dari metadata flat, jika ada."""
+    if entry.get('upload_date'):
+        return entry['upload_date']
+    timestamp = entry.get('timestamp') or entry.get('release_timestamp')
+    if timestamp:
+        return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime('%Y%m%d')
+    return None
+
+
+class EntryRef:
+    """Referensi ringkas satu entry playlist."""
+    __slots__ = ('id', 'title', 'duration', 'url', 'date', 'index', 'uploader', 'priority')
+
+    def __init__(self, id, title=None, duration=None, url=None, date=None, index=None, uploader=None):
+        self.id = id
+        self.title = title
+        self.duration = duration
+        self.url = url
+        self.date = date
+        # Posisi 1-based di playlist saat enumerasi (untuk filter range --items)
+        self.index = index
+        self.uploader = uploader
+        # Prioritas job untuk policy scheduler `priority` (lihat scheduler.TitlePriority)
+        self.priority = 0
+
+    @classmethod
+    def from_entry(cls, entry, index=None, uploader=None):
+        """`uploader` dipakai jika metadata flat entry tidak menyebut uploader."""
+        return cls(
+            entry.get('id'),
+            entry.get('title'),
+            entry.get('duration'),
+            entry.get('url') or entry.get('webpage_url'),
+            _entry_date(entry),
+            index,
+            entry.get('uploader') or entry.get('channel') or uploader,
+        )
+
+    def job_info(self):
+        """Info untuk scheduler supervisor (lihat scheduler.Job.from_info)."""
+        return {'id': self.id, 'duration': self.duration, 'uploader': self.uploader,
+                'priority': self.priority}
+
+    def __repr__(self):
+        return f"EntryRef({self.id!r}, {self.title!r})"
+
+
+class InfoSummary:
+    """Info video/playlist yang dibutuhkan UI, tanpa menyimpan dict mentah."""
+    __slots__ = (
+        'id', 'title', 'uploader', 'duration', 'view_count', 'webpage_url',
+        'is_playlist', 'is_live', 'page_size', '_playlist_count', '_entries', '_loaded',
+        '_position', '_complete', 'ladder',
+    )
+
+    def __init__(self, info, entries=None, page_size=DEFAULT_PAGE_SIZE):
+        self.id = info.get('id')
+        self.title = info.get('title')
+        self.uploader = info.get('uploader') or info.get('channel')
+        self.duration = info.get('duration')
+        self.view_count = info.get('view_count')
+        self.webpage_url = info.get('webpage_url') or info.get('original_url')
+        self.is_playlist = info.get('_type') == 'playlist'
+        self.is_live = bool(info.get('is_live')) or info.get('live_status') == 'is_live'
+        self.page_size = page_size
+        self._playlist_count = info.get('playlist_count')
+        self._loaded = []
+        self._position = 0
+        self._complete = False
+        if self.is_playlist:
+            self._entries = iter(entries if entries is not None else (info.get('entries') or []))
+            # Diisi oleh YouTubeHandler.probe_ladders jika diminta
+            self.ladder = None
+        else:
+            self._entries = None
+            self.ladder = FormatLadder.from_info(info) if info.get('formats') else None
+
+    @property
+    def count(self):
+        """Jumlah video; None jika belum diketahui (lihat `resolve_count`)."""
+        if self._playlist_count is not None:
+            return self._playlist_count
+        if self._complete:
+            return len(self._loaded)
+        return None
+
+    def resolve_count(self):
+        """Pastikan jumlah video diketahui. Bisa memicu paging (jangan di UI thread)."""
+        if self.count is None and self.is_playlist:
+            self._load_until(None)
+        return self.count
+
+    def entries_page(self, page):
+        """Ambil halaman ke-`page` (mulai dari 0) sebagai list `EntryRef`."""
+        start = page * self.page_size
+        end = start + self.page_size
+        self._load_until(end)
+        return self._loaded[start:end]
+
+    def iter_entries(self):
+        """Iterasi semua `EntryRef`, memuat halaman berikutnya sesuai kebutuhan."""
+        index = 0
+        while True:
+            self._load_until(index + 1)
+            if index >= len(self._loaded):
+                return
+            yield self._loaded[index]
+            index += 1
+
+    def _load_until(self, size):
+        if self._entries is None:
+            return
+        while size is None or len(self._loaded) < size:
+            try:
+                entry = next(self._entries)
+            except StopIteration:
+                self._entries = None
+                self._complete = True
+                return
+            # Entry kosong tetap dihitung agar index sama dengan yt-dlp
+            self._position += 1
+            if entry:
+                self._loaded.append(EntryRef.from_entry(entry, self._position, self.uploader))
+
+    def close(self):
+        """Hentikan paging yang belum selesai (menutup generator entries)."""
+        if self._entries is not None and hasattr(self._entries, 'close'):
+            self._entries.close()
+        self._entries = None
@@ -0,0 +1,211 @@
+"""
+Supervisor download berbasis proses.
+
+Setiap job download dijalankan di worker subprocess, bukan di interpreter
+utama. Progress dikirim balik lewat queue dan `progress_hook` tetap dipanggil
+di proses utama, jadi UI tidak perlu tahu bedanya. Worker yang hang (tidak
+ada progress selama `job_timeout` detik) atau bocor memori cukup di-kill
+tanpa mengganggu job lain, dan worker di-recycle setelah N job.
+
+Pakai lewat `YouTubeHandler(supervisor=DownloadSupervisor(...))`.
+"""
+
+import os
+import time
+import queue
+import threading
+import multiprocessing
+
+from scheduler import JobScheduler
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Key dari dict progress yt-dlp yang dikirim ke proses utama.
+# info_dict lengkap terlalu besar (dan belum tentu bisa di-pickle).
+PROGRESS_KEYS = (
+    'status', 'downloaded_bytes', 'total_bytes', 'total_bytes_estimate',
+    'speed', 'eta', 'elapsed', 'filename', 'tmpfilename',
+    'fragment_index', 'fragment_count', 'message',
+)
+INFO_KEYS = ('id', 'title', 'playlist_index', 'playlist_count', 'duration')
+
+POLL_INTERVAL = 0.2
+# Tanpa progress_hook, worker tetap mengirim tanda hidup (paling sering tiap N detik)
+HEARTBEAT_INTERVAL = 1.0
+
+
+def _slim_progress(d):
+    event = {key: d[key] for key in PROGRESS_KEYS if key in d}
+    info_dict = d.get('info_dict') or {}
+    event['info_dict'] = {key: info_dict.get(key) for key in INFO_KEYS}
+    return event
+
+
+def _worker_main(tasks, events, memory_limit_mb):
+    """Loop worker: ambil job dari `tasks`, kirim progress & hasil ke `events`."""
+    if memory_limit_mb and resource is not None:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    # Import di sini agar proses utama tidak perlu yt-dlp untuk spawn worker
+    from downloader import YouTubeHandler
+    handler = YouTubeHandler()
+
+    while True:
+        job = tasks.get()
+        if job is None:
+            return
+        url, options, want_progress = job
+
+        if want_progress:
+            def hook(d):
+                events.put(('progress', _slim_progress(d)))
+        else:
+            last_beat = [0.0]
+
+            def hook(d):
+                # Cukup tanda hidup untuk watchdog, tanpa isi progress
+                now = time.monotonic()
+                if now - last_beat[0] >= HEARTBEAT_INTERVAL:
+                    last_beat[0] = now
+                    events.put(('heartbeat',))
+
+        try:
+            success, msg = handler.download(url, options, hook)
+        except MemoryError:
+            success, msg = False, "Worker kehabisan memori (batas per job tercapai)"
+        except Exception as e:
+            success, msg = False, str(e)
+        events.put(('done', success, msg))
+
+
+class _Worker:
+    def __init__(self, ctx, memory_limit_mb):
+        self.tasks = ctx.Queue()
+        self.events = ctx.Queue()
+        self.jobs_done = 0
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(self.tasks, self.events, memory_limit_mb),
+            daemon=True,
+        )
+        self.process.start()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def retire(self, timeout=5):
+        """Minta worker berhenti setelah job saat ini."""
+        self.tasks.put(None)
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+
+
+class DownloadSupervisor:
+    """Pool worker subprocess dengan batas memori & watchdog per job dan recycling.
+
+    `job_timeout` adalah batas waktu *tanpa progress*: tenggatnya diperpanjang
+    setiap kali worker melaporkan progress, jadi download panjang yang tetap
+    berjalan tidak pernah di-kill, sedangkan worker yang macet tetap di-kill.
+    """
+
+    def __init__(self, max_workers=None, max_jobs_per_worker=20,
+                 memory_limit_mb=None, job_timeout=None, policy='fifo'):
+        self.max_workers = max_workers or os.cpu_count() or 2
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.memory_limit_mb = memory_limit_mb
+        self.job_timeout = job_timeout
+        # spawn: aman untuk thread (GUI) dan sama di semua OS
+        self._ctx = multiprocessing.get_context('spawn')
+        # Job yang antre menunggu worker dilayani sesuai policy (lihat scheduler.py)
+        self.scheduler = JobScheduler(self.max_workers, policy)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._closed = False
+
+    def download(self, url, options, progress_hook=None, cancel_event=None, job_info=None):
+        """Jalankan satu job di worker. Blocking; return (success, message).
+
+        `job_info` (dict dengan duration/filesize/uploader/priority) dipakai
+        policy scheduler untuk mengurutkan job yang antre.
+        """
+        job = self.scheduler.acquire(job_info)
+        try:
+            if cancel_event is not None and cancel_event.is_set():
+                # Dibatalkan selama antre: tidak perlu menyiapkan worker
+                return False, "Download dibatalkan"
+            worker = self._acquire()
+            try:
+                return self._run_job(worker, url, options, progress_hook, cancel_event)
+            finally:
+                self._release(worker)
+        finally:
+            self.scheduler.release(job)
+
+    def _acquire(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Supervisor sudah ditutup")
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.is_alive():
+                    return worker
+        return _Worker(self._ctx, self.memory_limit_mb)
+
+    def _release(self, worker):
+        if not worker.is_alive():
+            return
+        if worker.jobs_done >= self.max_jobs_per_worker or self._closed:
+            worker.retire()
+            return
+        with self._lock:
+            self._idle.append(worker)
+
+    def _run_job(self, worker, url, options, progress_hook, cancel_event):
+        worker.tasks.put((url, options, progress_hook is not None))
+        deadline = time.monotonic() + self.job_timeout if self.job_timeout else None
+
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                worker.kill()
+                return False, "Download dibatalkan"
+            try:
+                event = worker.events.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                if not worker.is_alive():
+                    worker.kill()
+                    return False, f"Worker berhenti tiba-tiba (exit code {worker.process.exitcode})"
+                if deadline and time.monotonic() > deadline:
+                    worker.kill()
+                    return False, f"Timeout: tidak ada progress selama {self.job_timeout} detik"
+                continue
+
+            if deadline:
+                # Watchdog: setiap event dari worker berarti job masih berjalan
+                deadline = time.monotonic() + self.job_timeout
+            if event[0] == 'progress':
+                try:
+                    progress_hook(event[1])
+                except Exception as e:
+                    # Hook boleh raise untuk membatalkan, sama seperti di yt-dlp
+                    worker.kill()
+                    return False, str(e)
+            elif event[0] == 'done':
+                worker.jobs_done += 1
+                return event[1], event[2]
+
+    def shutdown(self):
+        """Hentikan semua worker yang sedang idle."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.retire()
@@ -0,0 +1,247 @@
+"""
+Sinkronisasi inkremental channel/playlist.
+
+State setiap playlist disimpan di file JSON sendiri di folder output
+(`.sync_state/<playlist_id>.json`), jadi beberapa sync yang berjalan
+bersamaan ke folder output yang sama tidak saling menimpa. Setiap run hanya
+meng-enumerasi entries sampai bertemu konten yang sudah dikenal, lalu
+mendownload delta-nya saja (dari yang paling lama ke yang paling baru).
+
+Arah pertumbuhan playlist dicatat di state: enumerasi hanya berhenti lebih
+awal jika video baru terbukti muncul di depan (misal tab /videos channel).
+Playlist yang bertambah di belakang, atau yang arahnya belum diketahui,
+di-enumerasi penuh dan dibandingkan per id. Video yang gagal juga dicatat
+dan dicoba lagi pada run berikutnya.
+"""
+
+import os
+import re
+import json
+import time
+import tempfile
+import threading
+
+from summary import EntryRef
+
+STATE_DIRNAME = '.sync_state'
+# File state lama (semua playlist dalam satu file), hanya dibaca untuk migrasi
+LEGACY_STATE_FILENAME = '.sync_state.json'
+
+# Berhenti paging setelah sekian entry berturut-turut sudah dikenal.
+# Lebih dari 1 agar video yang di-pin / urutan yang sedikit bergeser
+# tidak membuat sync berhenti terlalu cepat.
+DEFAULT_STOP_AFTER = 3
+
+# Arah pertumbuhan playlist: video baru muncul di depan atau di belakang
+GROWS_HEAD = 'head'
+GROWS_TAIL = 'tail'
+
+
+def _read_json(path):
+    """Isi file JSON; None jika tidak ada atau rusak (mulai dari awal daripada gagal total)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class SyncState:
+    """State sync satu playlist dalam file JSON-nya sendiri."""
+
+    def __init__(self, output_dir, playlist_id):
+        self.output_dir = output_dir
+        self.playlist_id = playlist_id
+        safe_id = re.sub(r'[^\w.-]', '_', playlist_id)
+        self.path = os.path.join(output_dir, STATE_DIRNAME, f"{safe_id}.json")
+        self.record = {
+            'title': None,
+            'seen_ids': [],   # urutan playlist
+            'grows': None,    # GROWS_HEAD / GROWS_TAIL, None jika belum diketahui
+            'failed': {},     # id -> {title, url, duration, error}, dicoba lagi run berikutnya
+            'last_sync': None,
+        }
+        self.load()
+
+    def load(self):
+        data = _read_json(self.path)
+        if data is None:
+            # Migrasi dari file state bersama versi lama
+            legacy = _read_json(os.path.join(self.output_dir, LEGACY_STATE_FILENAME)) or {}
+            data = (legacy.get('playlists') or {}).get(self.playlist_id)
+        if data:
+            self.record['title'] = data.get('title')
+            self.record['seen_ids'] = list(data.get('seen_ids') or [])
+            self.record['grows'] = data.get('grows')
+            self.record['failed'] = dict(data.get('failed') or {})
+            self.record['last_sync'] = data.get('last_sync')
+
+    def save(self):
+        """Gabungkan dengan isi file saat ini, lalu tulis atomik (temp file + rename).
+
+        Jika sync lain untuk playlist yang sama sempat menyimpan, id yang
+        dicatatnya tetap dipertahankan, bukan ditimpa. Id gagal yang sudah
+        berhasil didownload tidak dikembalikan ke daftar gagal.
+        """
+        current = _read_json(self.path) or {}
+        seen = set(self.record['seen_ids'])
+        self.record['seen_ids'].extend(
+            video_id for video_id in current.get('seen_ids') or [] if video_id not in seen
+        )
+        seen.update(self.record['seen_ids'])
+        failed = self.record['failed']
+        for video_id, data in (current.get('failed') or {}).items():
+            if video_id not in failed and video_id not in seen:
+                failed[video_id] = data
+
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.state.', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': 2, 'id': self.playlist_id, **self.record}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def collect_delta(entries, known_ids, stop_after=DEFAULT_STOP_AFTER, grows=None):
+    """Ambil entries yang belum dikenal.
+
+    Jika `grows` adalah GROWS_HEAD, enumerasi berhenti setelah `stop_after`
+    entry dikenal berturut-turut; selain itu semua entries diperiksa, karena
+    video baru bisa berada di belakang. Return (new_entries, walked, grows)
+    dengan new_entries dalam urutan playlist dan grows arah yang terdeteksi
+    dari posisi video baru (atau `grows` semula jika tidak ada petunjuk).
+    """
+    new_entries = []
+    walked = 0
+    streak = 0
+    known_seen = False
+    detected = None
+    for entry in entries:
+        if not entry:
+            continue
+        walked += 1
+        video_id = entry.get('id')
+        if video_id in known_ids:
+            known_seen = True
+            streak += 1
+            if grows == GROWS_HEAD and streak >= stop_after:
+                break
+            continue
+        streak = 0
+        if known_ids and detected is None:
+            # Video baru pertama sebelum semua yang dikenal: playlist bertambah di depan
+            detected = GROWS_TAIL if known_seen else GROWS_HEAD
+        new_entries.append(entry)
+    if not known_ids:
+        detected = _grows_from_dates(new_entries)
+    return new_entries, walked, detected or grows
+
+
+def _grows_from_dates(entries):
+    """Tebak arah pertumbuhan dari tanggal upload (run pertama), jika tersedia."""
+    dates = [date for date in (EntryRef.from_entry(entry).date for entry in entries) if date]
+    if len(dates) < 2 or dates[0] == dates[-1]:
+        return None
+    return GROWS_HEAD if dates[0] > dates[-1] else GROWS_TAIL
+
+
+def sync_playlist(handler, url, output_dir, options, progress_hook=None,
+                  stop_after=DEFAULT_STOP_AFTER, on_item=None):
+    """Sync satu playlist/channel: enumerasi delta lalu download yang baru saja.
+
+    Setiap video baru adalah job tersendiri, jadi dengan supervisor job-job
+    ini berjalan paralel dan diurutkan oleh policy scheduler. Video yang
+    gagal pada run sebelumnya ikut didownload lagi. Return (result, error). `on_item(done, total, entry, success, message)`
+    dipanggil setiap satu video selesai jika diberikan.
+    """
+    try:
+        info, entries = handler.open_playlist(url)
+    except Exception as e:
+        return None, str(e)
+
+    if not info or info.get('_type') != 'playlist':
+        entries.close()
+        return None, "Mode sync hanya untuk URL playlist atau channel."
+
+    playlist_id = info.get('id') or url
+    state = SyncState(output_dir, playlist_id)
+    record = state.record
+    # Id yang gagal tidak dianggap baru; dicoba lagi dari data yang tersimpan
+    known_ids = set(record['seen_ids']) | set(record['failed'])
+
+    try:
+        new_entries, walked, grows = collect_delta(entries, known_ids, stop_after, record['grows'])
+    except Exception as e:
+        return None, str(e)
+    finally:
+        # Hentikan paging & tutup instance yt-dlp
+        entries.close()
+
+    playlist_title = info.get('title', 'Playlist')
+    uploader = info.get('uploader') or info.get('channel')
+    safe_title = "".join(x for x in playlist_title if x.isalnum() or x in " -_").strip()
+    dl_options = {
+        **options,
+        'outtmpl': os.path.join(output_dir, safe_title, '%(title)s [%(id)s]', '%(title)s [%(id)s].%(ext)s'),
+        # Per item, agar kegagalan bisa dideteksi dan item dicoba lagi run berikutnya
+        'ignoreerrors': False,
+    }
+
+    record['title'] = playlist_title
+    record['grows'] = grows
+    downloaded = set()
+    failed = []
+    lock = threading.Lock()
+    # Submit dari yang paling lama; tanpa supervisor ini juga urutan download
+    ordered = new_entries if grows == GROWS_TAIL else list(reversed(new_entries))
+    retries = [
+        EntryRef.from_entry({'id': video_id, **data}, uploader=uploader)
+        for video_id, data in record['failed'].items()
+    ]
+    pending = retries + [EntryRef.from_entry(entry, uploader=uploader) for entry in ordered]
+
+    def on_result(entry, success, msg):
+        with lock:
+            if success:
+                downloaded.add(entry.id)
+                record['failed'].pop(entry.id, None)
+                record['seen_ids'].append(entry.id)
+            else:
+                failed.append((entry.id, msg))
+                record['failed'][entry.id] = {
+                    'title': entry.title, 'url': entry.url, 'duration': entry.duration, 'error': msg,
+                }
+            # Simpan setiap item agar run yang terputus tidak mengulang dari awal
+            state.save()
+            if on_item:
+                on_item(len(downloaded) + len(failed), len(pending), entry, success, msg)
+
+    handler.download_entries(pending, dl_options, progress_hook, on_result=on_result)
+
+    # Job paralel selesai tidak berurutan: kembalikan seen_ids ke urutan playlist
+    new_ids = [entry.get('id') for entry in new_entries if entry.get('id') in downloaded]
+    # Retry yang berhasil tidak tahu posisinya lagi; diletakkan di ujung lama
+    retried_ids = [entry.id for entry in retries if entry.id in downloaded]
+    old_ids = [video_id for video_id in record['seen_ids'] if video_id not in downloaded]
+    if grows == GROWS_TAIL:
+        record['seen_ids'] = retried_ids + old_ids + new_ids
+    else:
+        record['seen_ids'] = new_ids + old_ids + retried_ids
+    record['last_sync'] = int(time.time())
+    state.save()
+
+    return {
+        'playlist_id': playlist_id,
+        'title': playlist_title,
+        'folder': os.path.join(output_dir, safe_title),
+        'new': len(new_entries),
+        'retried': len(retries),
+        'walked': walked,
+        'downloaded': [entry.id for entry in pending if entry.id in downloaded],
+        'failed': failed,
+    }, None
@@ -0,0 +1,459 @@
+"""
+Transport HTTP bersama untuk seluruh proses.
+
+Secara default setiap `YoutubeDL` membuat session dan pool koneksinya
+sendiri, jadi setiap item playlist membuka koneksi TCP/TLS baru ke host
+CDN yang sama. Modul ini mendaftarkan request handler yt-dlp yang memakai
+satu adapter (pool keep-alive per host) untuk semua instance YoutubeDL di
+proses ini, ditambah:
+
+- cache DNS (TTL) untuk koneksi pool bersama saja; `socket.getaddrinfo`
+  milik proses tidak diubah
+- resumption session TLS: session terakhir per host dipakai ulang saat
+  membuka koneksi baru, jadi handshake penuh hanya sekali per host
+- statistik: rasio reuse koneksi, handshake penuh vs resumed, estimasi
+  waktu handshake & DNS yang dihemat
+
+Pakai `install()` sekali (dipanggil oleh downloader.py). Cookie, header, dan
+opsi per YoutubeDL tetap per instance; hanya koneksi yang dibagi. Dengan
+`--isolate`, setiap worker subprocess punya transport-nya sendiri.
+
+Modul ini bergantung pada internal yt-dlp (`yt_dlp.networking._requests`),
+urllib3 dan `ssl.SSLSocket`. `install()` memeriksa interface tersebut lebih
+dulu; jika ada yang berubah di versi yang terpasang, yt-dlp tetap memakai
+request handler bawaannya (lihat `fallback_reason()`).
+"""
+
+import ssl
+import time
+import socket
+import inspect
+import http.cookiejar
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import urllib3
+    import requests
+    from yt_dlp.networking.common import register_rh, register_preference
+    from yt_dlp.networking._helper import make_ssl_context
+    from yt_dlp.networking._requests import RequestsRH, RequestsHTTPAdapter, RequestsSession
+except Exception:  # requests/urllib3 tidak terpasang atau internal yt-dlp berubah
+    RequestsRH = None
+
+DNS_TTL = 300
+POOL_HOSTS = 32       # jumlah host yang pool-nya disimpan
+POOL_MAXSIZE = 32     # koneksi idle maksimum per host
+WARM_UP_TIMEOUT = 10
+
+_installed = False
+# Alasan transport bersama tidak aktif (diisi oleh install())
+_fallback_reason = None
+
+
+class TransportStats:
+    """Counter transport, aman dipakai dari banyak thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.connections = 0
+            self.session_hosts = 0
+            self.full_handshakes = 0
+            self.full_handshake_time = 0.0
+            self.resumed_handshakes = 0
+            self.resumed_handshake_time = 0.0
+            self.dns_hits = 0
+            self.dns_misses = 0
+            self.dns_miss_time = 0.0
+
+    def add(self, **values):
+        with self._lock:
+            for name, value in values.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self):
+        with self._lock:
+            requests_ = self.requests
+            connections = self.connections
+            session_hosts = self.session_hosts
+            full, full_time = self.full_handshakes, self.full_handshake_time
+            resumed, resumed_time = self.resumed_handshakes, self.resumed_handshake_time
+            dns_hits, dns_misses, dns_time = self.dns_hits, self.dns_misses, self.dns_miss_time
+
+        avg_full = full_time / full if full else 0.0
+        avg_resumed = resumed_time / resumed if resumed else 0.0
+        avg_dns = dns_time / dns_misses if dns_misses else 0.0
+        reused = max(requests_ - connections, 0)
+        # Tanpa pool bersama, setiap session (instance YoutubeDL) membuka minimal
+        # satu koneksi per host. Selisihnya adalah handshake penuh yang dihindari;
+        # koneksi baru yang resumed menghemat selisih penuh vs resumed.
+        avoided = max(session_hosts - connections, 0)
+        handshake_saved = avoided * avg_full + resumed * max(avg_full - avg_resumed, 0.0)
+        return {
+            'requests': requests_,
+            'connections': connections,
+            'reused': reused,
+            'avoided': avoided,
+            'reuse_rate': reused / requests_ if requests_ else 0.0,
+            'full_handshakes': full,
+            'resumed_handshakes': resumed,
+            'avg_full_handshake': avg_full,
+            'avg_resumed_handshake': avg_resumed,
+            'handshake_saved': handshake_saved,
+            'dns_hits': dns_hits,
+            'dns_misses': dns_misses,
+            'dns_saved': dns_hits * avg_dns,
+        }
+
+
+STATS = TransportStats()
+
+
+class DnsCache:
+    """Cache hasil resolusi DNS dengan TTL (hanya hasil sukses).
+
+    Hanya dipakai oleh koneksi pool bersama; kode lain di proses ini tetap
+    memanggil `socket.getaddrinfo` langsung.
+    """
+
+    def __init__(self, ttl=DNS_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host, port, family=socket.AF_UNSPEC):
+        """Alamat IP (urut sesuai getaddrinfo, tanpa duplikat) untuk host:port."""
+        key = (host, port, family)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            STATS.add(dns_hits=1)
+            return entry[1]
+
+        start = time.perf_counter()
+        infos = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+        STATS.add(dns_misses=1, dns_miss_time=time.perf_counter() - start)
+        addresses = tuple(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses)
+        return addresses
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+DNS_CACHE = DnsCache()
+
+
+class ResumingSSLSocket(ssl.SSLSocket):
+    """SSLSocket yang memakai ulang session TLS terakhir untuk host yang sama."""
+
+    @classmethod
+    def _create(cls, sock, server_hostname=None, context=None, session=None, **kwargs):
+        cache = getattr(context, 'session_cache', None)
+        if session is None and cache is not None and server_hostname:
+            session = cache.get(server_hostname)
+
+        start = time.perf_counter()
+        try:
+            self = super()._create(sock, server_hostname=server_hostname, context=context,
+                                   session=session, **kwargs)
+        except ssl.SSLError:
+            # Session kedaluwarsa/ditolak: buang supaya koneksi berikutnya handshake penuh
+            if cache is not None and server_hostname:
+                cache.pop(server_hostname, None)
+            raise
+        elapsed = time.perf_counter() - start
+
+        self._session_saved = False
+        if cache is not None and server_hostname and self._connected:
+            if self.session_reused:
+                STATS.add(resumed_handshakes=1, resumed_handshake_time=elapsed)
+            else:
+                STATS.add(full_handshakes=1, full_handshake_time=elapsed)
+            self._save_session()
+        return self
+
+    def _save_session(self):
+        # TLS 1.3 mengirim session ticket setelah handshake, jadi baru
+        # tersedia setelah data pertama dibaca
+        session = self.session
+        if session is not None and (session.has_ticket or self.version() != 'TLSv1.3'):
+            self.context.session_cache[self.server_hostname] = session
+            self._session_saved = True
+
+    def recv_into(self, *args, **kwargs):
+        result = super().recv_into(*args, **kwargs)
+        if not self._session_saved and self.context.session_cache is not None:
+            self._save_session()
+        return result
+
+
+def _supports_resumption():
+    """`ssl.SSLSocket._create` (internal CPython) masih menerima `session`?"""
+    try:
+        return 'session' in inspect.signature(ssl.SSLSocket._create).parameters
+    except (AttributeError, TypeError, ValueError):
+        return False
+
+
+TLS_RESUMPTION = _supports_resumption()
+
+
+def _resuming_context(context):
+    # Tanpa interface yang dikenal, SSLSocket bawaan dipakai (handshake penuh)
+    if TLS_RESUMPTION:
+        context.session_cache = {}
+        context.sslsocket_class = ResumingSSLSocket
+    return context
+
+
+if RequestsRH is not None:
+
+    class _CountingConnectionMixin:
+        def _new_conn(self):
+            # Socket baru, termasuk reconnect setelah server menutup keep-alive
+            STATS.add(connections=1)
+            host = self._dns_host
+            try:
+                addresses = DNS_CACHE.resolve(host, self.port, urllib3.util.connection.allowed_gai_family())
+            except OSError:
+                # Biarkan urllib3 melaporkan kegagalan resolusi seperti biasa
+                return super()._new_conn()
+
+            # Coba alamat dari cache satu per satu; Host header & SNI tetap self.host
+            error = None
+            try:
+                for address in addresses:
+                    self._dns_host = address
+                    try:
+                        return super()._new_conn()
+                    except (OSError, urllib3.exceptions.HTTPError) as e:
+                        error = e
+            finally:
+                self._dns_host = host
+            raise error
+
+    class _CountingHTTPConnection(_CountingConnectionMixin, urllib3.connection.HTTPConnection):
+        pass
+
+    class _CountingHTTPSConnection(_CountingConnectionMixin, urllib3.connection.HTTPSConnection):
+        pass
+
+    class _CountingPoolMixin:
+        def urlopen(self, *args, **kwargs):
+            # Dipanggil sekali per request (termasuk retry & redirect)
+            STATS.add(requests=1)
+            return super().urlopen(*args, **kwargs)
+
+    class _CountingHTTPConnectionPool(_CountingPoolMixin, urllib3.HTTPConnectionPool):
+        ConnectionCls = _CountingHTTPConnection
+
+    class _CountingHTTPSConnectionPool(_CountingPoolMixin, urllib3.HTTPSConnectionPool):
+        ConnectionCls = _CountingHTTPSConnection
+
+    class _SharedSession(RequestsSession):
+        """Session per YoutubeDL; mencatat host yang pernah dipakainya."""
+
+        def __init__(self):
+            super().__init__()
+            self._hosts = set()
+
+        def send(self, request, **kwargs):
+            host = urllib3.util.parse_url(request.url).netloc
+            if host not in self._hosts:
+                self._hosts.add(host)
+                STATS.add(session_hosts=1)
+            return super().send(request, **kwargs)
+
+    class SharedHTTPAdapter(RequestsHTTPAdapter):
+        """Adapter yang dipakai bersama oleh semua session; tidak ikut ditutup."""
+
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                'http': _CountingHTTPConnectionPool,
+                'https': _CountingHTTPSConnectionPool,
+            }
+
+        def close(self):
+            # Session YoutubeDL ditutup setiap selesai; pool tetap hidup
+            pass
+
+        def shutdown(self):
+            super().close()
+
+    _adapters = {}
+    _adapters_lock = threading.Lock()
+
+    def shared_adapter(verify=True, legacy_ssl=False, use_certifi=True, client_cert=None,
+                       source_address=None):
+        """Adapter bersama untuk kombinasi opsi TLS tertentu (dibuat sekali)."""
+        client_cert = client_cert or {}
+        key = (verify, bool(legacy_ssl), use_certifi, tuple(sorted(client_cert.items())), source_address)
+        with _adapters_lock:
+            adapter = _adapters.get(key)
+            if adapter is None:
+                context = _resuming_context(make_ssl_context(
+                    verify=verify, legacy_support=legacy_ssl, use_certifi=use_certifi, **client_cert))
+                adapter = _adapters[key] = SharedHTTPAdapter(
+                    ssl_context=context,
+                    source_address=source_address,
+                    pool_connections=POOL_HOSTS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=urllib3.util.retry.Retry(False),
+                )
+            return adapter
+
+    @register_rh
+    class SharedRequestsRH(RequestsRH):
+        """RequestsRH dengan pool koneksi bersama antar instance YoutubeDL."""
+        RH_NAME = 'requests (shared)'
+
+        def _create_instance(self, cookiejar, legacy_ssl_support=None):
+            session = _SharedSession()
+            adapter = shared_adapter(
+                verify=self.verify,
+                legacy_ssl=legacy_ssl_support if legacy_ssl_support is not None else self.legacy_ssl_support,
+                use_certifi=not self.prefer_system_certs,
+                client_cert=self._client_cert,
+                source_address=self.source_address,
+            )
+            session.adapters.clear()
+            session.headers = requests.models.CaseInsensitiveDict()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.cookies = cookiejar
+            session.trust_env = False
+            return session
+
+    @register_preference(SharedRequestsRH)
+    def shared_requests_preference(rh, request):
+        # Di atas RequestsRH biasa (100) hanya jika install() sudah dipanggil
+        return 50 if _installed else -1000
+
+
+def available():
+    return RequestsRH is not None
+
+
+def _check_interface():
+    """Coba bangun session lewat handler bersama; return pesan error atau None."""
+    try:
+        if not isinstance(getattr(urllib3.connection.HTTPConnection('localhost'), '_dns_host', None), str):
+            return "urllib3 HTTPConnection._dns_host tidak tersedia"
+        handler = SharedRequestsRH(logger=None)
+        try:
+            session = handler._create_instance(http.cookiejar.CookieJar())
+            adapter = session.get_adapter('https://localhost/')
+            session.close()
+        finally:
+            handler.close()
+        if not isinstance(adapter, SharedHTTPAdapter):
+            return "session yt-dlp tidak memakai adapter bersama"
+    except Exception as e:
+        return f"interface yt-dlp/urllib3 tidak cocok ({type(e).__name__}: {e})"
+    return None
+
+
+def install(dns_ttl=DNS_TTL):
+    """Aktifkan transport bersama untuk proses ini (idempotent).
+
+    Return True jika aktif. Jika internal yt-dlp/urllib3 yang dipakai tidak
+    cocok dengan versi terpasang, yt-dlp tetap memakai handler bawaannya.
+    """
+    global _installed, _fallback_reason
+    DNS_CACHE.ttl = dns_ttl
+    if not available():
+        _fallback_reason = "requests/urllib3 atau internal yt-dlp tidak tersedia"
+        return False
+    if not _installed:
+        _fallback_reason = _check_interface()
+        _installed = _fallback_reason is None
+    return _installed
+
+
+def fallback_reason():
+    """Alasan transport bersama tidak aktif; None jika aktif atau belum di-install."""
+    return _fallback_reason
+
+
+def uninstall():
+    """Kembali ke transport default yt-dlp (pool yang ada ditutup)."""
+    global _installed
+    DNS_CACHE.clear()
+    if available():
+        _installed = False
+        with _adapters_lock:
+            for adapter in _adapters.values():
+                adapter.shutdown()
+            _adapters.clear()
+
+
+def pool_manager():
+    """PoolManager bersama (opsi TLS default), untuk fetch di luar yt-dlp."""
+    if not _installed:
+        return None
+    adapter = shared_adapter()
+    return adapter.poolmanager
+
+
+def warm_up(urls, max_workers=4):
+    """Buka koneksi (DNS + TCP + TLS) ke host dari `urls` di background.
+
+    Koneksi dikembalikan ke pool bersama, jadi request pertama ke host
+    tersebut tidak perlu menunggu handshake. Return Future-future-nya.
+    """
+    manager = pool_manager()
+    if manager is None:
+        return []
+    origins = []
+    for url in urls:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        if parts.scheme in ('http', 'https') and origin not in origins:
+            origins.append(origin)
+
+    def connect(origin):
+        pool = manager.connection_from_url(origin)
+        conn = pool._get_conn()
+        try:
+            if not conn.is_connected:
+                conn.timeout = WARM_UP_TIMEOUT
+                conn.connect()
+        except Exception:
+            conn.close()
+            raise
+        finally:
+            pool._put_conn(conn)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='transport-warmup')
+    futures = [executor.submit(connect, origin) for origin in origins]
+    executor.shutdown(wait=False)
+    return futures
+
+
+def stats():
+    return STATS.snapshot()
+
+
+def format_stats(snapshot=None):
+    if _fallback_reason:
+        return f"Transport bersama tidak aktif: {_fallback_reason}"
+    s = snapshot or stats()
+    return "\n".join([
+        f"Request HTTP      : {s['requests']} lewat {s['connections']} koneksi "
+        f"(reuse {s['reuse_rate'] * 100:.1f}%, {s['avoided']} koneksi baru dihindari)",
+        f"Handshake TLS     : {s['full_handshakes']} penuh ({s['avg_full_handshake'] * 1000:.1f} ms), "
+        f"{s['resumed_handshakes']} resumed ({s['avg_resumed_handshake'] * 1000:.1f} ms)",
+        f"Waktu dihemat     : handshake ~{s['handshake_saved']:.2f} s, DNS ~{s['dns_saved']:.2f} s "
+        f"({s['dns_hits']} hit / {s['dns_misses']} miss)",
+    ])
@@ -0,0 +1,133 @@
+"""
+Lapisan penulisan output: staging + rename atomik + fsync bertahap.
+
+yt-dlp menulis file sementara (.part, stream sebelum merge, audio sebelum
+ekstraksi) ke folder staging di filesystem yang sama dengan output, lalu
+memindahkannya dengan rename setelah post-processing selesai. Konsumen
+downstream tidak pernah melihat file setengah jadi di folder output.
+
+Setiap writer (satu job download) punya subfolder staging sendiri di bawah
+`.staging/`, sehingga job paralel, termasuk di worker subprocess supervisor,
+tidak pernah membersihkan folder milik job lain.
+
+Durabilitas (fsync) dikumpulkan per batch di seluruh playlist: setiap file
+dan folder hanya di-fsync sekali saat flush, bukan per tahap per item.
+"""
+
+import os
+import uuid
+import shutil
+
+STAGING_DIRNAME = '.staging'
+DEFAULT_FSYNC_BATCH = 20
+
+# Percobaan membuat folder staging job; folder induk `.staging` bisa sedang
+# dihapus (karena kosong) oleh job lain yang baru selesai.
+_MAKEDIRS_ATTEMPTS = 3
+
+
+def split_outtmpl(outtmpl):
+    """Pisahkan outtmpl absolut jadi (folder_home, template_relatif).
+
+    Folder sebelum komponen pertama yang mengandung field `%(...)` menjadi
+    folder home; sisanya tetap template.
+    """
+    parts = os.path.normpath(outtmpl).split(os.sep)
+    for index, part in enumerate(parts):
+        if '%(' in part:
+            home = os.sep.join(parts[:index]) or '.'
+            return home, os.path.join(*parts[index:])
+    return os.path.dirname(outtmpl) or '.', os.path.basename(outtmpl)
+
+
+def _fsync_path(path, directory=False):
+    if directory and os.name == 'nt':
+        # Windows tidak bisa membuka folder untuk fsync
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class OutputWriter:
+    """Ubah opsi yt-dlp agar menulis lewat staging dan fsync per batch."""
+
+    def __init__(self, fsync_batch=DEFAULT_FSYNC_BATCH):
+        self.fsync_batch = fsync_batch
+        self.staging_dir = None
+        self.home = None
+        self._pending_files = []
+        self._pending_dirs = set()
+
+    def apply(self, opts):
+        """Return salinan opsi yt-dlp dengan staging, remux sekali jalan & post hook."""
+        opts = dict(opts)
+        outtmpl = opts.get('outtmpl')
+        if isinstance(outtmpl, str) and 'paths' not in opts:
+            home, template = split_outtmpl(outtmpl)
+            self.home = home
+            self.staging_dir = os.path.join(home, STAGING_DIRNAME, uuid.uuid4().hex)
+            self._make_staging_dir()
+            opts['outtmpl'] = template
+            opts['paths'] = {'home': home, 'temp': self.staging_dir}
+
+        # Audio: jika codec tujuan sama dengan stream sumber, ekstraksi cukup
+        # copy stream (tanpa re-encode / tulis ulang).
+        for pp in opts.get('postprocessors') or []:
+            if pp.get('key') == 'FFmpegExtractAudio' and pp.get('preferredcodec') == 'm4a':
+                if opts.get('format') == 'bestaudio/best':
+                    opts['format'] = 'bestaudio[ext=m4a]/bestaudio/best'
+
+        opts['post_hooks'] = list(opts.get('post_hooks') or []) + [self.on_file_finished]
+        return opts
+
+    def on_file_finished(self, filepath):
+        """Dipanggil yt-dlp setelah file final dipindahkan ke folder output."""
+        self._pending_files.append(filepath)
+        self._pending_dirs.add(os.path.dirname(os.path.abspath(filepath)))
+        if len(self._pending_files) >= self.fsync_batch:
+            self.flush()
+
+    def flush(self):
+        """Fsync semua file & folder yang tertunda, masing-masing sekali."""
+        for filepath in self._pending_files:
+            _fsync_path(filepath)
+        # Folder induk juga, agar entry hasil rename ikut tersimpan
+        dirs = set(self._pending_dirs)
+        dirs.update(os.path.dirname(d) for d in self._pending_dirs)
+        for directory in sorted(dirs):
+            _fsync_path(directory, directory=True)
+        self._pending_files = []
+        self._pending_dirs = set()
+
+    def _make_staging_dir(self):
+        # Dibuat di awal agar `.staging` tidak kosong selama job berjalan
+        for attempt in range(_MAKEDIRS_ATTEMPTS):
+            try:
+                os.makedirs(self.staging_dir, exist_ok=True)
+                return
+            except FileNotFoundError:
+                # `.staging` dihapus job lain di antara dua mkdir; ulangi
+                if attempt == _MAKEDIRS_ATTEMPTS - 1:
+                    raise
+
+    def close(self):
+        self.flush()
+        if not self.staging_dir:
+            return
+        # Folder staging job ini saja yang dihapus. Sisa .part tidak bisa
+        # di-resume oleh job lain (folder-nya unik per job), jadi ikut dihapus.
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+        try:
+            # Folder induk bersama hanya hilang jika tidak ada job lain di dalamnya
+            os.rmdir(os.path.dirname(self.staging_dir))
+        except OSError:
+            pass
+        self.staging_dir = None